@@ -17,20 +17,53 @@ Architecture:
     → Output (5 gesture probabilities)
 """
 
+import weakref
 import numpy as np
 import pandas as pd
-from typing import Tuple, List, Optional
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Tuple, List, Optional, Union
 
 # TensorFlow/Keras imports (will be available after requirements update)
 try:
+    import tensorflow as tf
     from tensorflow import keras
     from tensorflow.keras import layers, models
-    from tensorflow.keras.utils import to_categorical
     KERAS_AVAILABLE = True
 except ImportError:
     KERAS_AVAILABLE = False
     print("Warning: TensorFlow/Keras not available. Install with: pip install tensorflow")
 
+# Optional: pyarrow's multithreaded CSV reader (pandas is the fallback)
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Optional: ONNX Runtime for low-overhead CPU inference (see export_onnx)
+try:
+    import onnxruntime as ort
+    ONNXRUNTIME_AVAILABLE = True
+except ImportError:
+    ONNXRUNTIME_AVAILABLE = False
+
+# Sensor value columns as recorded in session CSVs
+SENSOR_VALUE_COLUMNS = [
+    'accel_x', 'accel_y', 'accel_z',
+    'gyro_x', 'gyro_y', 'gyro_z',
+    'rot_w', 'rot_x', 'rot_y', 'rot_z'
+]
+
+# LSTM settings required for Keras to dispatch to the fused cuDNN kernel
+CUDNN_LSTM_ARGS = {
+    'activation': 'tanh',
+    'recurrent_activation': 'sigmoid',
+    'recurrent_dropout': 0.0,
+    'unroll': False,
+    'use_bias': True,
+}
+
 
 # ==================== MODEL ARCHITECTURE ====================
 
@@ -40,7 +73,8 @@ def create_cnn_lstm_model(
     cnn_filters: Tuple[int, int] = (64, 128),
     lstm_units: Tuple[int, int] = (128, 64),
     dense_units: int = 64,
-    dropout_rate: float = 0.3
+    dropout_rate: float = 0.3,
+    mixed_precision: Optional[bool] = None
 ) -> 'keras.Model':
     """
     Creates a CNN/LSTM hybrid model for gesture recognition.
@@ -60,6 +94,10 @@ def create_cnn_lstm_model(
         lstm_units: Number of units in LSTM layers (default: (128, 64))
         dense_units: Number of units in Dense layer (default: 64)
         dropout_rate: Dropout rate for regularization (default: 0.3)
+        mixed_precision: Build the model with the mixed_float16 policy (Tensor
+                    Cores), False for float32. None (default) enables it when
+                    a GPU is visible. The Keras global policy is restored
+                    afterwards, so other models are not affected.
     
     Returns:
         Compiled Keras model ready for training
@@ -81,6 +119,31 @@ def create_cnn_lstm_model(
     if not KERAS_AVAILABLE:
         raise ImportError("TensorFlow/Keras is required. Install with: pip install tensorflow")
     
+    if mixed_precision is None:
+        mixed_precision = bool(tf.config.list_physical_devices('GPU'))
+    
+    # Layers take their dtype policy from the global one when they are created
+    # (and compile() adds loss scaling under mixed_float16), so set it for this
+    # model only and restore the caller's policy afterwards
+    previous_policy = keras.mixed_precision.global_policy()
+    keras.mixed_precision.set_global_policy('mixed_float16' if mixed_precision else 'float32')
+    try:
+        return _build_cnn_lstm_model(
+            input_shape, num_classes, cnn_filters, lstm_units, dense_units, dropout_rate
+        )
+    finally:
+        keras.mixed_precision.set_global_policy(previous_policy)
+
+
+def _build_cnn_lstm_model(
+    input_shape: Tuple[int, int],
+    num_classes: int,
+    cnn_filters: Tuple[int, int],
+    lstm_units: Tuple[int, int],
+    dense_units: int,
+    dropout_rate: float
+) -> 'keras.Model':
+    """Builds and compiles the model of create_cnn_lstm_model under the current dtype policy."""
     model = models.Sequential([
         # Input layer (implicit from first Conv1D)
         
@@ -107,10 +170,15 @@ def create_cnn_lstm_model(
         layers.MaxPooling1D(pool_size=2, name='max_pool_2'),
         
         # ===== LSTM Temporal Processing =====
+        # The LSTM arguments are pinned to the cuDNN-compatible configuration
+        # (tanh/sigmoid, no recurrent dropout, not unrolled, with bias); any
+        # other value silently falls back to the much slower generic kernel on
+        # GPU. Regularize with the separate Dropout layers instead.
         # First LSTM layer (return sequences for second LSTM)
         layers.LSTM(
             units=lstm_units[0],
             return_sequences=True,
+            **CUDNN_LSTM_ARGS,
             name='lstm_1'
         ),
         layers.Dropout(dropout_rate, name='dropout_1'),
@@ -119,6 +187,7 @@ def create_cnn_lstm_model(
         layers.LSTM(
             units=lstm_units[1],
             return_sequences=False,
+            **CUDNN_LSTM_ARGS,
             name='lstm_2'
         ),
         layers.Dropout(dropout_rate, name='dropout_2'),
@@ -132,10 +201,12 @@ def create_cnn_lstm_model(
         ),
         layers.Dropout(dropout_rate, name='dropout_3'),
         
-        # Output layer
+        # Output layer (softmax kept in float32 for numerical stability
+        # under mixed precision)
         layers.Dense(
             units=num_classes,
             activation='softmax',
+            dtype='float32',
             name='output'
         )
     ], name='CNN_LSTM_Gesture_Model')
@@ -152,12 +223,68 @@ def create_cnn_lstm_model(
 
 # ==================== DATA PREPARATION ====================
 
+def _sort_by_timestamp(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Orders rows by timestamp (stable, NaN last), returning df itself when it is
+    already in order, as recordings usually are, instead of a sorted copy.
+    
+    Only row order matters to the callers, which work on the underlying arrays,
+    so the index is left as it is.
+    """
+    timestamps = df['timestamp'].to_numpy()
+    if (np.diff(timestamps) >= 0).all():
+        return df
+    return df.iloc[np.argsort(timestamps, kind='stable')]
+
+
+def _label_windows(
+    center_times: np.ndarray,
+    labels_data: pd.DataFrame,
+    gesture_to_idx: dict
+) -> np.ndarray:
+    """
+    Assigns a gesture index to each window from the label at its center time.
+    
+    A window gets the first label (in timestamp order) whose interval
+    [timestamp, timestamp + duration) contains its center time. Since label
+    starts are sorted, the candidates are the labels before
+    searchsorted(starts, t, 'right'); the first of them still running at t is
+    the first whose running maximum end time exceeds t, also a searchsorted.
+    
+    Args:
+        center_times: Timestamp at the center of each window
+        labels_data: DataFrame with columns [timestamp, gesture, duration],
+                    sorted by timestamp
+        gesture_to_idx: Mapping from gesture name to class index (0, 1, ...
+                       in insertion order)
+    
+    Returns:
+        np.ndarray of class indices, -1 for windows without a (known) label
+    """
+    starts = labels_data['timestamp'].to_numpy(dtype=float)
+    ends = starts + labels_data['duration'].to_numpy(dtype=float)
+    # Category codes are the class indices; unknown gestures get code -1
+    gestures = pd.Categorical(labels_data['gesture'], categories=list(gesture_to_idx)).codes
+    
+    # Labels with a missing end never match, so they must not raise the running max
+    running_end = np.maximum.accumulate(np.where(np.isnan(ends), -np.inf, ends))
+    
+    candidates = np.searchsorted(starts, center_times, side='right')
+    first_running = np.searchsorted(running_end, center_times, side='right')
+    
+    window_labels = np.full(len(center_times), -1)
+    matched = first_running < candidates
+    window_labels[matched] = gestures[first_running[matched]]
+    return window_labels
+
+
 def prepare_data_for_training(
     sensor_data: pd.DataFrame,
     labels_data: pd.DataFrame,
     window_size: int = 50,
     stride: int = 25,
-    sensor_columns: Optional[List[str]] = None
+    sensor_columns: Optional[List[str]] = None,
+    dtype: Union[str, np.dtype] = np.float32
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Prepares continuous sensor data for CNN/LSTM training using sliding windows.
@@ -177,6 +304,9 @@ def prepare_data_for_training(
         window_size: Number of timesteps per window (default: 50 = 1 second at 50Hz)
         stride: Step size for sliding window (default: 25 = 50% overlap)
         sensor_columns: List of sensor column names to use (default: all 10 sensors)
+        dtype: dtype of X (default: float32, half the memory of float64 and the
+               precision Keras trains in). 'bfloat16' uses TensorFlow's NumPy
+               bfloat16 type, for mixed_bfloat16 training.
     
     Returns:
         X: np.ndarray of shape (num_samples, window_size, num_features)
@@ -206,24 +336,24 @@ def prepare_data_for_training(
     }
     
     # Process sensor data: separate rows per sensor need to be merged
-    # Separate by sensor type
+    # Separate by sensor type (read-only slices: merge() builds new frames, so
+    # no defensive copies are needed)
     if 'sensor' in sensor_data.columns:
         accel_data = sensor_data[sensor_data['sensor'] == 'linear_acceleration'][
             ['timestamp', 'accel_x', 'accel_y', 'accel_z']
-        ].copy()
+        ]
         gyro_data = sensor_data[sensor_data['sensor'] == 'gyroscope'][
             ['timestamp', 'gyro_x', 'gyro_y', 'gyro_z']
-        ].copy()
+        ]
         rot_data = sensor_data[sensor_data['sensor'] == 'rotation_vector'][
             ['timestamp', 'rot_w', 'rot_x', 'rot_y', 'rot_z']
-        ].copy()
+        ]
         
         # Get all unique timestamps
         all_timestamps = pd.DataFrame({'timestamp': sorted(sensor_data['timestamp'].unique())})
         
         # Merge all sensors on timestamp
-        sensor_processed = all_timestamps.copy()
-        sensor_processed = sensor_processed.merge(accel_data, on='timestamp', how='left')
+        sensor_processed = all_timestamps.merge(accel_data, on='timestamp', how='left')
         sensor_processed = sensor_processed.merge(gyro_data, on='timestamp', how='left')
         sensor_processed = sensor_processed.merge(rot_data, on='timestamp', how='left')
         
@@ -233,70 +363,81 @@ def prepare_data_for_training(
         # Fill any remaining NaN (at the beginning) with 0
         sensor_processed[sensor_columns] = sensor_processed[sensor_columns].fillna(0)
     else:
-        # Data is already processed
-        sensor_processed = sensor_data.copy()
+        # Data is already processed (it is only read from below, so the
+        # caller's DataFrame is never modified)
+        sensor_processed = sensor_data
     
     # Sort data by timestamp
-    sensor_processed = sensor_processed.sort_values('timestamp').reset_index(drop=True)
-    labels_data = labels_data.sort_values('timestamp').reset_index(drop=True)
+    sensor_processed = _sort_by_timestamp(sensor_processed)
+    labels_data = _sort_by_timestamp(labels_data)
     
-    # Extract windows
-    X_windows = []
-    y_labels = []
+    # Sliding window start rows, labelled by the timestamp at each window's center
+    window_starts = np.arange(0, len(sensor_processed) - window_size, stride)
+    center_times = sensor_processed['timestamp'].to_numpy()[window_starts + window_size // 2]
+    window_labels = _label_windows(center_times, labels_data, gesture_to_idx)
     
-    # Create sliding windows
-    for start_idx in range(0, len(sensor_processed) - window_size, stride):
-        end_idx = start_idx + window_size
-        
-        # Extract window
-        window = sensor_processed.iloc[start_idx:end_idx]
-        
-        # Get timestamp at center of window
-        center_time = window['timestamp'].iloc[window_size // 2]
-        
-        # Find corresponding label
-        label = None
-        for _, label_row in labels_data.iterrows():
-            label_start = label_row['timestamp']
-            label_end = label_start + label_row['duration']
-            
-            if label_start <= center_time < label_end:
-                label = label_row['gesture']
-                break
-        
-        if label is None:
-            continue  # Skip windows without labels
-        
-        # Extract features
-        try:
-            features = window[sensor_columns].values
-            
-            # Check if window has correct shape
-            if features.shape[0] != window_size:
-                continue
-            
-            X_windows.append(features)
-            y_labels.append(gesture_to_idx[label])
-            
-        except KeyError:
-            # Some sensor columns might be missing, skip this window
-            continue
+    # Skip windows without labels
+    labelled = window_labels >= 0
     
-    if len(X_windows) == 0:
+    missing_columns = [col for col in sensor_columns if col not in sensor_processed.columns]
+    if missing_columns:
+        raise ValueError(
+            f"No valid windows could be extracted. Missing sensor columns: {missing_columns}"
+        )
+    if not labelled.any():
         raise ValueError("No valid windows could be extracted. Check sensor data format.")
     
-    # Convert to numpy arrays
-    X = np.array(X_windows)
-    y = to_categorical(y_labels, num_classes=5)
+    # Extract windows: a zero-copy (rows, window_size, features) view over the
+    # sensor matrix; only the labelled windows are copied out of it
+    if dtype == 'bfloat16':
+        if not KERAS_AVAILABLE:
+            raise ImportError("TensorFlow/Keras is required for bfloat16")
+        dtype = tf.bfloat16.as_numpy_dtype
+    sensor_array = sensor_processed[sensor_columns].to_numpy(dtype=dtype)
+    windows = sliding_window_view(sensor_array, window_size, axis=0).transpose(0, 2, 1)
+    
+    X = np.ascontiguousarray(windows[window_starts[labelled]])
+    y_labels = window_labels[labelled]
+    # One-hot encode by gathering rows of the identity matrix (float32, like
+    # keras' to_categorical, without needing TensorFlow for data preparation)
+    y = np.eye(5, dtype=np.float32)[y_labels]
     
     return X, y
 
 
+def _read_csv(filepath: str, value_dtype: np.dtype = np.float64) -> pd.DataFrame:
+    """
+    Reads a sensor or labels CSV, with pyarrow's parallel parser when available.
+    
+    Column dtypes are pinned at parse time: sensor values are parsed straight
+    into value_dtype, timestamps and durations stay float64 (float32 cannot
+    resolve milliseconds over a 10 minute session), and string columns
+    (sensor, gesture) become pandas categoricals, so their few distinct values
+    are stored once instead of as a Python str per row. An all-empty numeric
+    column still reads as NaN.
+    """
+    column_dtypes = {col: value_dtype for col in SENSOR_VALUE_COLUMNS}
+    column_dtypes.update(timestamp=np.float64, duration=np.float64)
+    
+    if not PYARROW_AVAILABLE:
+        column_dtypes.update(sensor='category', gesture='category')
+        return pd.read_csv(filepath, dtype=column_dtypes)
+    
+    convert_options = pa_csv.ConvertOptions(
+        column_types={col: pa.from_numpy_dtype(dt) for col, dt in column_dtypes.items()},
+        strings_can_be_null=True,
+        auto_dict_encode=True
+    )
+    table = pa_csv.read_csv(filepath, convert_options=convert_options)
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
 def create_sliding_window_dataset(
     sensor_file: str,
     labels_file: str,
     window_size: int = 50,
-    stride: int = 25
+    stride: int = 25,
+    dtype: Union[str, np.dtype] = np.float32
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Convenience function to load data from files and prepare for training.
@@ -306,6 +447,7 @@ def create_sliding_window_dataset(
         labels_file: Path to labels CSV
         window_size: Window size in timesteps
         stride: Stride for sliding window
+        dtype: dtype of X (see prepare_data_for_training)
     
     Returns:
         X, y: Training data ready for model.fit()
@@ -317,17 +459,172 @@ def create_sliding_window_dataset(
         ... )
         >>> model.fit(X, y, epochs=50, validation_split=0.2)
     """
-    sensor_data = pd.read_csv(sensor_file)
-    labels_data = pd.read_csv(labels_file)
+    # Sensor values are parsed directly in the training precision (float32
+    # for float32/bfloat16 X), so no float64 copy of the session is built
+    value_dtype = np.float64 if dtype in (np.float64, 'float64') else np.float32
+    sensor_data = _read_csv(sensor_file, value_dtype)
+    labels_data = _read_csv(labels_file)
     
     return prepare_data_for_training(
         sensor_data,
         labels_data,
         window_size=window_size,
-        stride=stride
+        stride=stride,
+        dtype=dtype
     )
 
 
+def create_tf_dataset(
+    sensor_files: List[str],
+    labels_files: List[str],
+    window_size: int = 50,
+    stride: int = 25,
+    batch_size: int = 32,
+    shuffle_buffer: int = 10000,
+    num_features: int = 10
+) -> 'tf.data.Dataset':
+    """
+    Builds a tf.data input pipeline over several recording sessions.
+    
+    Sessions are loaded and windowed in parallel (interleave), the windows are
+    cached after the first epoch, and batches are prefetched, so CSV parsing
+    overlaps training instead of stalling it. Each session goes through
+    create_sliding_window_dataset, so the samples are identical to it.
+    
+    Args:
+        sensor_files: Paths to sensor data CSVs
+        labels_files: Paths to the matching labels CSVs
+        window_size: Window size in timesteps
+        stride: Stride for sliding window
+        batch_size: Samples per batch
+        shuffle_buffer: Shuffle buffer size in samples (0 to keep file order)
+        num_features: Sensor columns per timestep (default: all 10 sensors)
+    
+    Returns:
+        Batched tf.data.Dataset of (X, y) ready for model.fit()
+    
+    Example:
+        >>> dataset = create_tf_dataset(
+        ...     ['data/continuous/session_01.csv', 'data/continuous/session_02.csv'],
+        ...     ['data/continuous/session_01_labels.csv', 'data/continuous/session_02_labels.csv']
+        ... )
+        >>> model.fit(dataset, epochs=50)
+    """
+    if not KERAS_AVAILABLE:
+        raise ImportError("TensorFlow/Keras is required")
+    
+    def load_session(sensor_file, labels_file):
+        return create_sliding_window_dataset(
+            sensor_file.decode(),
+            labels_file.decode(),
+            window_size=window_size,
+            stride=stride
+        )
+    
+    def session_windows(sensor_file, labels_file):
+        X, y = tf.numpy_function(
+            load_session, [sensor_file, labels_file], (tf.float32, tf.float32)
+        )
+        X.set_shape([None, window_size, num_features])
+        y.set_shape([None, 5])
+        return tf.data.Dataset.from_tensor_slices((X, y))
+    
+    dataset = tf.data.Dataset.from_tensor_slices((sensor_files, labels_files)).interleave(
+        session_windows,
+        num_parallel_calls=tf.data.AUTOTUNE,
+        deterministic=False
+    ).cache()
+    
+    if shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer)
+    
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
+
+def to_tfrecord(X: np.ndarray, y: np.ndarray, filepath: str):
+    """
+    Save prepared windows to a TFRecord file, one tf.train.Example per window.
+    
+    Windowing only has to run once per dataset: later training runs read the
+    file back with from_tfrecord instead of re-parsing the CSVs.
+    
+    Args:
+        X: Windows of shape (num_samples, window_size, num_features)
+        y: One-hot labels of shape (num_samples, num_classes)
+        filepath: Path to write (e.g., 'data/continuous/train.tfrecord')
+    """
+    if not KERAS_AVAILABLE:
+        raise ImportError("TensorFlow/Keras is required")
+    
+    X_flat = np.asarray(X, dtype=np.float32).reshape(len(X), -1)
+    y = np.asarray(y, dtype=np.float32)
+    
+    with tf.io.TFRecordWriter(filepath) as writer:
+        for window, label in zip(X_flat, y):
+            example = tf.train.Example(features=tf.train.Features(feature={
+                'X': tf.train.Feature(float_list=tf.train.FloatList(value=window)),
+                'y': tf.train.Feature(float_list=tf.train.FloatList(value=label)),
+            }))
+            writer.write(example.SerializeToString())
+    
+    print(f"Saved {len(X)} windows to {filepath}")
+
+
+def from_tfrecord(
+    filepath: str,
+    window_size: int = 50,
+    num_features: int = 10,
+    num_classes: int = 5,
+    batch_size: int = 32,
+    shuffle_buffer: int = 10000,
+    cache: bool = True
+) -> 'tf.data.Dataset':
+    """
+    Load windows saved by to_tfrecord as a batched, prefetched tf.data.Dataset.
+    
+    Records are parsed in parallel and, with cache=True (for datasets that fit
+    in RAM), only read from disk during the first epoch.
+    
+    Args:
+        filepath: Path of the TFRecord file
+        window_size: Window size in timesteps the file was written with
+        num_features: Sensor columns per timestep the file was written with
+        num_classes: Number of gesture classes (default: 5)
+        batch_size: Samples per batch
+        shuffle_buffer: Shuffle buffer size in samples (0 to keep file order)
+        cache: Keep parsed windows in memory after the first epoch
+    
+    Returns:
+        Batched tf.data.Dataset of (X, y) ready for model.fit()
+    
+    Example:
+        >>> X, y = create_sliding_window_dataset('session_01.csv', 'session_01_labels.csv')
+        >>> to_tfrecord(X, y, 'session_01.tfrecord')
+        >>> model.fit(from_tfrecord('session_01.tfrecord'), epochs=50)
+    """
+    if not KERAS_AVAILABLE:
+        raise ImportError("TensorFlow/Keras is required")
+    
+    feature_spec = {
+        'X': tf.io.FixedLenFeature([window_size * num_features], tf.float32),
+        'y': tf.io.FixedLenFeature([num_classes], tf.float32),
+    }
+    
+    def parse_example(record):
+        example = tf.io.parse_single_example(record, feature_spec)
+        return tf.reshape(example['X'], [window_size, num_features]), example['y']
+    
+    dataset = tf.data.TFRecordDataset(filepath).map(
+        parse_example, num_parallel_calls=tf.data.AUTOTUNE
+    )
+    
+    if cache:
+        dataset = dataset.cache()
+    if shuffle_buffer:
+        dataset = dataset.shuffle(shuffle_buffer)
+    
+    return dataset.batch(batch_size).prefetch(tf.data.AUTOTUNE)
+
 # ==================== MODEL UTILITIES ====================
 
 def save_model(model: 'keras.Model', filepath: str):
@@ -363,8 +660,276 @@ def load_model(filepath: str) -> 'keras.Model':
     return model
 
 
-def predict_gesture(
+def quantize_model(
     model: 'keras.Model',
+    representative_data: np.ndarray,
+    filepath: Optional[str] = None,
+    num_calibration_samples: int = 200
+) -> bytes:
+    """
+    Convert a trained model to a fully INT8-quantized TFLite model.
+    
+    Weights and activations are stored as int8 (about 4x smaller), so inference
+    runs on int8 dot-product kernels (ARM NEON, x86 VNNI) instead of float32.
+    Activation ranges are calibrated on representative_data, which should be
+    real training windows. Input and output tensors are int8 too: quantize
+    windows with the input tensor's (scale, zero_point) before invoking.
+    
+    Note: on x86 without VNNI, TFLite int8 kernels can be slower than float32;
+    benchmark with the XNNPACK delegate (benchmark_model --use_xnnpack=true).
+    
+    Args:
+        model: Trained Keras model
+        representative_data: Windows of shape (num_samples, window_size, num_features)
+        filepath: Optional path to save the model (e.g., 'models/cnn_lstm_gesture_int8.tflite')
+        num_calibration_samples: Windows used for calibration (default: 200)
+    
+    Returns:
+        Serialized TFLite model
+    """
+    if not KERAS_AVAILABLE:
+        raise ImportError("TensorFlow/Keras is required")
+    
+    def representative_dataset():
+        for window in representative_data[:num_calibration_samples]:
+            yield [window[np.newaxis].astype(np.float32)]
+    
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.representative_dataset = representative_dataset
+    converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+    converter.inference_input_type = tf.int8
+    converter.inference_output_type = tf.int8
+    tflite_model = converter.convert()
+    
+    if filepath is not None:
+        with open(filepath, 'wb') as f:
+            f.write(tflite_model)
+        print(f"Quantized model saved to {filepath} ({len(tflite_model) / 1024:.1f} KB)")
+    
+    return tflite_model
+
+
+def fuse_batchnorm_for_inference(model: 'keras.Model') -> 'keras.Model':
+    """
+    Return an inference-only copy of the model with BatchNormalization folded
+    into the following layer's weights.
+    
+    Here BatchNormalization follows the Conv1D's ReLU, so it cannot be folded
+    back into that Conv1D. It is a per-channel affine map (x * scale + shift),
+    though, so it folds forward into the next Conv1D, LSTM or Dense input
+    kernel and bias. MaxPooling1D and Dropout (identity at inference) are
+    passed through; max pooling commutes with the map only when every scale is
+    positive. A BatchNormalization that cannot be folded is kept as is.
+    
+    Outputs are unchanged up to float rounding. Call this when exporting a
+    trained model (e.g. before export_onnx or quantize_model), never before
+    training: the returned model is not compiled.
+    
+    Args:
+        model: Trained Sequential Keras model
+    
+    Returns:
+        New Sequential model without the folded BatchNormalization layers
+    """
+    if not KERAS_AVAILABLE:
+        raise ImportError("TensorFlow/Keras is required")
+    
+    fused = []  # (layer config source, weights)
+    pending = None  # BatchNormalization layer waiting to be folded
+    
+    for layer in model.layers:
+        if isinstance(layer, layers.BatchNormalization):
+            if pending is not None:
+                fused.append((pending, pending.get_weights()))
+            pending = layer
+            continue
+        
+        weights = layer.get_weights()
+        
+        if pending is not None:
+            gamma, beta, moving_mean, moving_var = pending.get_weights()
+            scale = gamma / np.sqrt(moving_var + pending.epsilon)
+            shift = beta - moving_mean * scale
+            
+            if isinstance(layer, layers.Dropout) or (
+                isinstance(layer, layers.MaxPooling1D) and np.all(scale > 0)
+            ):
+                # Pass the pending affine map through this layer
+                fused.append((layer, weights))
+                continue
+            
+            if isinstance(layer, layers.Conv1D) and layer.padding == 'valid' and layer.use_bias:
+                # kernel: (kernel_size, in_channels, filters)
+                kernel, bias = weights
+                weights = [kernel * scale[None, :, None],
+                           bias + np.einsum('kio,i->o', kernel, shift)]
+            elif isinstance(layer, (layers.LSTM, layers.Dense)) and layer.use_bias:
+                # Input kernel: (in_features, units); the LSTM recurrent kernel is unaffected
+                kernel, *rest, bias = weights
+                weights = [kernel * scale[:, None], *rest, bias + shift @ kernel]
+            else:
+                fused.append((pending, pending.get_weights()))
+            pending = None
+        
+        fused.append((layer, weights))
+    
+    if pending is not None:
+        fused.append((pending, pending.get_weights()))
+    
+    new_layers = [layer.__class__.from_config(layer.get_config()) for layer, _ in fused]
+    fused_model = models.Sequential(
+        [keras.Input(shape=model.input_shape[1:])] + new_layers,
+        name=f"{model.name}_fused"
+    )
+    for new_layer, (_, weights) in zip(new_layers, fused):
+        new_layer.set_weights(weights)
+    
+    return fused_model
+
+
+def export_onnx(
+    model: 'keras.Model',
+    filepath: str,
+    quantize: bool = False
+) -> str:
+    """
+    Export a trained model to ONNX for inference with ONNX Runtime.
+    
+    keras' model.predict costs milliseconds of framework overhead per call,
+    more than this small model's compute. ONNX Runtime fuses Conv+BN+ReLU when
+    the session is created and runs each window with little overhead.
+    
+    Args:
+        model: Trained Keras model
+        filepath: Path to save the model (e.g., 'models/cnn_lstm_gesture.onnx')
+        quantize: Also write an int8 dynamically quantized copy
+                  ('*.int8.onnx'), faster on CPUs with VNNI/NEON dot products
+    
+    Returns:
+        Path of the model to load (the int8 copy when quantize=True)
+    """
+    if not KERAS_AVAILABLE:
+        raise ImportError("TensorFlow/Keras is required")
+    try:
+        import onnx
+        import tf2onnx
+    except ImportError:
+        raise ImportError("ONNX export requires: pip install tf2onnx onnx")
+    
+    input_signature = (
+        tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32, name='input'),
+    )
+    onnx_model, _ = tf2onnx.convert.from_keras(model, input_signature=input_signature, opset=17)
+    onnx.save(onnx_model, filepath)
+    print(f"ONNX model saved to {filepath}")
+    
+    if quantize:
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        
+        quantized_path = str(filepath).replace('.onnx', '') + '.int8.onnx'
+        quantize_dynamic(filepath, quantized_path, weight_type=QuantType.QInt8)
+        print(f"Quantized ONNX model saved to {quantized_path}")
+        return quantized_path
+    
+    return filepath
+
+
+def load_onnx_model(filepath: str) -> 'ort.InferenceSession':
+    """
+    Load a model exported by export_onnx as a CPU ONNX Runtime session.
+    
+    The session can be passed to predict_gesture in place of a Keras model.
+    Create it once and reuse it; session creation runs the graph optimizer.
+    
+    Args:
+        filepath: Path to the .onnx model
+    
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    if not ONNXRUNTIME_AVAILABLE:
+        raise ImportError("ONNX Runtime is required. Install with: pip install onnxruntime")
+    
+    session = ort.InferenceSession(str(filepath), providers=['CPUExecutionProvider'])
+    print(f"ONNX model loaded from {filepath}")
+    return session
+
+
+# Traced inference function per Keras model (see _inference_function). Weakly
+# keyed, so an entry (and its graph) goes away with its model
+_INFERENCE_FUNCTIONS = weakref.WeakKeyDictionary()
+
+
+def _inference_function(model: 'keras.Model'):
+    """
+    Returns a tf.function running model(x, training=False), traced once per model.
+    
+    Unlike model.predict, which builds a dataset and runs its Python loop on
+    every call, the traced graph is called directly; the batch dimension is
+    left open so single windows and batches share it.
+    """
+    infer = _INFERENCE_FUNCTIONS.get(model)
+    if infer is None:
+        # The function holds the model weakly; a strong reference from the
+        # cached value would keep its own key alive
+        model_ref = weakref.ref(model)
+        signature = [tf.TensorSpec((None,) + tuple(model.input_shape[1:]), tf.float32)]
+        infer = tf.function(lambda x: model_ref()(x, training=False), input_signature=signature)
+        _INFERENCE_FUNCTIONS[model] = infer
+    return infer
+
+
+def _predict_probabilities(
+    model: Union['keras.Model', 'ort.InferenceSession'],
+    sensor_windows: np.ndarray
+) -> np.ndarray:
+    """Class probabilities for a batch of windows (num_windows, window_size, num_features)."""
+    sensor_windows = np.asarray(sensor_windows, dtype=np.float32)
+    if ONNXRUNTIME_AVAILABLE and isinstance(model, ort.InferenceSession):
+        input_name = model.get_inputs()[0].name
+        return model.run(None, {input_name: sensor_windows})[0]
+    return _inference_function(model)(sensor_windows).numpy()
+
+
+def predict_gesture_batch(
+    model: Union['keras.Model', 'ort.InferenceSession'],
+    sensor_windows: np.ndarray,
+    gesture_names: Optional[List[str]] = None
+) -> List[Tuple[str, float]]:
+    """
+    Predict gestures for several windows with a single model call.
+    
+    Per-call framework overhead dominates for this small model, so callers
+    holding several windows (offline evaluation, several streams) should
+    batch them here rather than loop over predict_gesture.
+    
+    Args:
+        model: Trained CNN/LSTM model, or an ONNX Runtime session from
+               load_onnx_model
+        sensor_windows: Sensor data of shape (num_windows, window_size, num_features)
+        gesture_names: List of gesture names (default: standard 5 gestures)
+    
+    Returns:
+        List of (gesture_name, confidence), one per window
+    
+    Example:
+        >>> for gesture, confidence in predict_gesture_batch(model, X_test[:32]):
+        ...     print(f"{gesture} ({confidence:.2%})")
+    """
+    if gesture_names is None:
+        gesture_names = ['jump', 'punch', 'turn', 'walk', 'noise']
+    
+    predictions = _predict_probabilities(model, sensor_windows)
+    gesture_indices = np.argmax(predictions, axis=1)
+    confidences = predictions[np.arange(len(predictions)), gesture_indices]
+    
+    return [(gesture_names[idx], confidence)
+            for idx, confidence in zip(gesture_indices.tolist(), confidences.tolist())]
+
+
+def predict_gesture(
+    model: Union['keras.Model', 'ort.InferenceSession'],
     sensor_window: np.ndarray,
     gesture_names: Optional[List[str]] = None
 ) -> Tuple[str, float]:
@@ -372,7 +937,8 @@ def predict_gesture(
     Predict gesture from sensor window.
     
     Args:
-        model: Trained CNN/LSTM model
+        model: Trained CNN/LSTM model, or an ONNX Runtime session from
+               load_onnx_model (much lower per-call overhead)
         sensor_window: Sensor data of shape (window_size, num_features)
         gesture_names: List of gesture names (default: standard 5 gestures)
     
@@ -391,7 +957,7 @@ def predict_gesture(
         sensor_window = np.expand_dims(sensor_window, axis=0)
     
     # Predict
-    prediction = model.predict(sensor_window, verbose=0)
+    prediction = _predict_probabilities(model, sensor_window)
     
     # Get result
     gesture_idx = np.argmax(prediction[0])
@@ -14,36 +14,187 @@ Usage:
 """
 
 import os
+import csv
+import mmap
 import shutil
 import argparse
 from pathlib import Path
-import pandas as pd
 import numpy as np
 from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 import json
+import random
+import re
 
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False  # Windows
 
-def analyze_data_distribution(input_dir):
+# Worker threads for per-file I/O (opens, links, copies); the work is
+# syscall-bound, so threads overlap it despite the GIL
+IO_WORKERS = 8
+
+# Buffer for copies that cannot be done in the kernel (1 MiB; shutil uses 64 KiB)
+COPY_BUFFER_SIZE = 1024 * 1024
+
+# Linux ioctl that clones a file's extents into another (_IOW(0x94, 9, int))
+FICLONE = 0x40049409
+
+
+# Classifies input files by name (format: gesture_timestamp.csv OR
+# gesture_type_timestamp.csv):
+#   turn:    compound names "turn_left" and "turn_right"
+#   noise:   all noise-related files (noise_, locomotion_, action_ segments)
+#   gesture: the other classes; the original baseline_noise recording is
+#            skipped since its segments are used instead
+GESTURE_FILE_PATTERN = re.compile(
+    r'(?:(?P<turn>turn_(?:left|right))'
+    r'|(?P<noise>noise|locomotion|action)'
+    r'|(?!baseline_noise)(?P<gesture>jump|punch|walk|idle|baseline))_.*\.csv',
+    re.DOTALL
+)
+
+
+def scan_dataset(input_dir):
+    """
+    List the CSV files in the input directory in a single pass.
+
+    The result can be passed to the other functions here (csv_entries
+    argument) so the directory is only listed once per run.
+
+    Returns:
+        list: os.DirEntry for each regular .csv file, in directory order
+    """
+    with os.scandir(input_dir) as entries:
+        return [entry for entry in entries if entry.name.endswith('.csv') and entry.is_file()]
+
+
+def analyze_data_distribution(input_dir, csv_entries=None):
     """
     Analyze the distribution of gesture classes.
 
     Returns:
         dict: Gesture counts
     """
-    gesture_counts = {}
+    return {gesture: len(files) for gesture, files in scan_gesture_files(input_dir, csv_entries).items()}
+
 
-    for filename in os.listdir(input_dir):
-        if not filename.endswith('.csv'):
-            continue
+def scan_gesture_files(input_dir, csv_entries=None):
+    """
+    Group the input CSV files by gesture class.
 
-        # Extract gesture from filename (format: gesture_timestamp.csv)
-        gesture = filename.split('_')[0]
-        gesture_counts[gesture] = gesture_counts.get(gesture, 0) + 1
+    Returns:
+        dict: Gesture name -> list of filenames, in directory order
+    """
+    gesture_files = {}
 
-    return gesture_counts
+    for gesture, filename in iter_gesture_files(input_dir, csv_entries):
+        gesture_files.setdefault(gesture, []).append(filename)
 
+    return gesture_files
 
-def segment_baseline_noise(input_dir, output_dir, samples_per_sec=50, segment_duration=5.0):
+
+def iter_gesture_files(input_dir, csv_entries=None):
+    """
+    Yield (gesture, filename) for each recognised input CSV file, in directory order.
+    """
+    if csv_entries is None:
+        csv_entries = scan_dataset(input_dir)
+
+    for entry in csv_entries:
+        match = GESTURE_FILE_PATTERN.fullmatch(entry.name)
+        if match:
+            yield match['turn'] or match['gesture'] or 'noise', entry.name
+
+
+def fast_copy(src, dst):
+    """
+    Copy file contents in the kernel with os.copy_file_range.
+
+    On copy-on-write filesystems (Btrfs, XFS) this shares extents instead of
+    copying data. Where copy_file_range is unavailable (non-Linux, older
+    kernels, some cross-filesystem copies) the file is copied through one
+    reused COPY_BUFFER_SIZE buffer.
+    """
+    with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        try:
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+        except (AttributeError, OSError):
+            fsrc.seek(0)
+            fdst.seek(0)
+            fdst.truncate()
+            buffer = memoryview(bytearray(COPY_BUFFER_SIZE))
+            while True:
+                read = fsrc.readinto(buffer)
+                if not read:
+                    break
+                fdst.write(buffer[:read])
+
+
+def reflink_copy(src, dst):
+    """
+    Clone src to dst with the FICLONE ioctl, so both files share extents.
+
+    Only copy-on-write filesystems (Btrfs, XFS) support clones; elsewhere the
+    data is copied with fast_copy. Unlike a hardlink, writing to dst never
+    modifies src.
+    """
+    if FCNTL_AVAILABLE:
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                return
+            except OSError:
+                pass  # Filesystem does not support reflinks
+
+    fast_copy(src, dst)
+
+
+def link_or_copy(src, dst, copy_mode='hardlink', preserve_metadata=False):
+    """
+    Place src at dst without duplicating its data where possible.
+
+    Args:
+        src: Source file
+        dst: Destination path (replaced if it already exists)
+        copy_mode: 'hardlink' (falls back to a symlink across filesystems),
+                   'symlink', 'reflink' (a copy-on-write clone, see
+                   reflink_copy) or 'copy' (an independent copy, see fast_copy)
+        preserve_metadata: For 'reflink' and 'copy', also copy timestamps
+                           and permissions
+    """
+    # Replace rather than write through an existing link into the source file
+    if os.path.lexists(dst):
+        os.remove(dst)
+
+    if copy_mode in ('reflink', 'copy'):
+        if copy_mode == 'reflink':
+            reflink_copy(src, dst)
+        else:
+            fast_copy(src, dst)
+        if preserve_metadata:
+            shutil.copystat(src, dst)
+        return
+
+    if copy_mode == 'hardlink':
+        try:
+            os.link(src, dst)
+            return
+        except OSError:
+            pass  # Different filesystem or no hardlink support
+
+    os.symlink(os.path.abspath(src), dst)
+
+
+def segment_baseline_noise(input_dir, output_dir, samples_per_sec=50, segment_duration=5.0,
+                           csv_entries=None):
     """
     Segment the baseline noise CSV into multiple samples for training.
 
@@ -52,50 +203,74 @@ def segment_baseline_noise(input_dir, output_dir, samples_per_sec=50, segment_du
         output_dir: Directory to save segmented baseline samples
         samples_per_sec: Sensor data rate (default 50Hz)
         segment_duration: Duration of each segment in seconds (default 5.0s)
+        csv_entries: Result of scan_dataset(input_dir), if already available
 
     Returns:
         list: Filenames of segmented baseline samples
     """
-    baseline_files = [f for f in os.listdir(input_dir) if f.startswith('baseline_noise') and f.endswith('.csv')]
+    if csv_entries is None:
+        csv_entries = scan_dataset(input_dir)
+
+    baseline_files = [entry.path for entry in csv_entries if entry.name.startswith('baseline_noise')]
 
     if not baseline_files:
         print("⚠️  No baseline_noise file found")
         return []
 
-    baseline_file = Path(input_dir) / baseline_files[0]
+    baseline_file = Path(baseline_files[0])
     print(f"\n📊 Segmenting baseline noise: {baseline_file.name}")
 
-    # Read the baseline CSV
-    df = pd.read_csv(baseline_file)
-    total_samples = len(df)
     segment_size = int(segment_duration * samples_per_sec)
 
-    print(f"   Total samples: {total_samples}")
-    print(f"   Segment size: {segment_size} samples ({segment_duration}s at {samples_per_sec}Hz)")
-
-    # Create segments
-    segmented_files = []
-    segment_count = 0
-
-    for i in range(0, total_samples - segment_size + 1, segment_size):
-        segment = df.iloc[i:i + segment_size]
-
-        if len(segment) == segment_size:
-            segment_count += 1
-            filename = f"baseline_segment_{segment_count:03d}.csv"
-            filepath = Path(output_dir) / filename
-            segment.to_csv(filepath, index=False)
-            segmented_files.append(filename)
+    # Segments are cut at line boundaries straight from the file bytes, so
+    # rows are written exactly as recorded without parsing the CSV
+    with open(baseline_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        data = np.frombuffer(mm, dtype=np.uint8)
+
+        # Line i is mm[line_starts[i]:line_ends[i]], including its newline
+        line_ends = np.flatnonzero(data == ord('\n')) + 1
+        if len(line_ends) == 0 or line_ends[-1] != len(data):
+            line_ends = np.append(line_ends, len(data))  # Last line has no newline
+        line_starts = np.concatenate(([0], line_ends[:-1]))
+
+        # Data rows follow the header; blank lines are skipped, as pd.read_csv does
+        first_bytes = data[np.minimum(line_starts, len(data) - 1)]
+        blank = (line_ends == line_starts) | (first_bytes == ord('\n')) | (first_bytes == ord('\r'))
+        rows = np.flatnonzero(~blank[1:]) + 1
+        del data, first_bytes  # Release the buffer so the mmap can be closed
+
+        total_samples = len(rows)
+        print(f"   Total samples: {total_samples}")
+        print(f"   Segment size: {segment_size} samples ({segment_duration}s at {samples_per_sec}Hz)")
+
+        # Create segments (full segments only; the remainder is dropped)
+        segment_count = total_samples // segment_size
+        segmented_files = [f"baseline_segment_{n:03d}.csv" for n in range(1, segment_count + 1)]
+        header = mm[line_starts[0]:line_ends[0]]
+
+        def write_segment(segment, filename):
+            start = line_starts[rows[segment * segment_size]]
+            end = line_ends[rows[(segment + 1) * segment_size - 1]]
+            with open(Path(output_dir) / filename, 'wb') as out:
+                out.write(header)
+                out.write(mm[start:end])
+
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+            list(executor.map(write_segment, range(segment_count), segmented_files))
 
     print(f"   ✅ Created {segment_count} baseline segments")
 
     return segmented_files
 
 
-def copy_and_balance_data(input_dir, output_dir, target_samples_per_class=30):
+def copy_and_balance_data(input_dir, output_dir, target_samples_per_class=30, copy_mode='hardlink',
+                          preserve_metadata=False, csv_entries=None):
     """
     Copy data files to organized structure with class balancing.
 
+    Files are hard-linked by default: a recording can appear in up to three
+    classifier directories, and links share its data instead of copying it.
+
     For majority classes: Randomly select target_samples_per_class
     For minority classes: Copy all available samples
 
@@ -103,7 +278,13 @@ def copy_and_balance_data(input_dir, output_dir, target_samples_per_class=30):
         input_dir: Source directory with all CSV files
         output_dir: Target directory for organized data
         target_samples_per_class: Target number of samples per class
+        copy_mode: 'hardlink', 'symlink', 'reflink' or 'copy' (see link_or_copy)
+        preserve_metadata: Keep source timestamps/permissions on copies
+        csv_entries: Result of scan_dataset(input_dir), if already available
     """
+    if csv_entries is None:
+        csv_entries = scan_dataset(input_dir)
+
     # Create output directory structure
     binary_dir = Path(output_dir) / "binary_classification"
     multiclass_dir = Path(output_dir) / "multiclass_classification"
@@ -115,7 +296,7 @@ def copy_and_balance_data(input_dir, output_dir, target_samples_per_class=30):
     # Segment baseline noise first (creates temporary files)
     temp_baseline_dir = Path(output_dir) / "temp_baseline"
     temp_baseline_dir.mkdir(exist_ok=True)
-    baseline_segments = segment_baseline_noise(input_dir, temp_baseline_dir)
+    baseline_segments = segment_baseline_noise(input_dir, temp_baseline_dir, csv_entries=csv_entries)
 
     # Binary classification: walk vs idle (locomotion states)
     (binary_dir / "walk").mkdir(exist_ok=True)
@@ -130,103 +311,98 @@ def copy_and_balance_data(input_dir, output_dir, target_samples_per_class=30):
     (noise_dir / "active").mkdir(exist_ok=True)
     (noise_dir / "baseline").mkdir(exist_ok=True)
 
-    # Collect files by gesture
-    gesture_files = {
-        'jump': [],
-        'punch': [],
-        'turn_left': [],
-        'turn_right': [],
-        'walk': [],
-        'idle': [],
-        'baseline': baseline_segments,  # Use segmented baseline files
-        'noise': []
-    }
-
-    for filename in os.listdir(input_dir):
-        if not filename.endswith('.csv'):
-            continue
-
-        # Skip the original baseline_noise file (we're using segments)
-        if filename.startswith('baseline_noise'):
-            continue
-
-        # Extract gesture from filename
-        # Format can be: gesture_timestamp.csv OR gesture_type_timestamp.csv
-        parts = filename.split('_')
-
-        # Handle compound names like "turn_left" and "turn_right"
-        if parts[0] == 'turn' and len(parts) > 1 and parts[1] in ['left', 'right']:
-            gesture = f"{parts[0]}_{parts[1]}"
-        elif parts[0] in ['noise', 'locomotion', 'action']:
-            gesture = 'noise'  # Group all noise-related files
+    # Collect files by gesture, undersampling majority classes as they are
+    # scanned: each class keeps a uniform random sample of at most
+    # target_samples_per_class files (reservoir sampling), so the full file
+    # lists are never held in memory
+    gesture_counts = dict.fromkeys(
+        ['jump', 'punch', 'turn_left', 'turn_right', 'walk', 'idle', 'baseline', 'noise'], 0
+    )
+    balanced_files = {gesture: [] for gesture in gesture_counts}
+    rng = random.Random(42)
+
+    def add_file(gesture, filename):
+        gesture_counts[gesture] += 1
+        reservoir = balanced_files[gesture]
+        if len(reservoir) < target_samples_per_class:
+            reservoir.append(filename)
         else:
-            gesture = parts[0]
+            slot = rng.randrange(gesture_counts[gesture])
+            if slot < target_samples_per_class:
+                reservoir[slot] = filename
+
+    for filename in baseline_segments:  # Use segmented baseline files
+        add_file('baseline', filename)
 
-        if gesture in gesture_files:
-            gesture_files[gesture].append(filename)
+    for gesture, filename in iter_gesture_files(input_dir, csv_entries):
+        add_file(gesture, filename)
 
     # Print initial distribution
     print("\n📊 Initial Data Distribution:")
-    for gesture, files in gesture_files.items():
-        print(f"  {gesture}: {len(files)} samples")
-
-    # Balance classes by undersampling majority
-    balanced_files = {}
-    for gesture, files in gesture_files.items():
-        if len(files) > target_samples_per_class:
-            # Undersample majority class
-            import random
-            random.seed(42)
-            balanced_files[gesture] = random.sample(files, target_samples_per_class)
-            print(f"  ⚖️  {gesture}: Undersampled {len(files)} → {target_samples_per_class}")
-        else:
-            balanced_files[gesture] = files
-            if len(files) < target_samples_per_class:
-                print(f"  ⚠️  {gesture}: Only {len(files)} samples (need more data or augmentation)")
+    for gesture, count in gesture_counts.items():
+        print(f"  {gesture}: {count} samples")
+
+    # Report balancing
+    for gesture, count in gesture_counts.items():
+        if count > target_samples_per_class:
+            print(f"  ⚖️  {gesture}: Undersampled {count} → {target_samples_per_class}")
+        elif count < target_samples_per_class:
+            print(f"  ⚠️  {gesture}: Only {count} samples (need more data or augmentation)")
 
     # Copy files to organized structure
     print("\n📁 Organizing files...")
 
+    # Collect (source, destination) pairs for every placement
+    placements = []
+
     # Binary classification: walk vs idle
     for filename in balanced_files['walk']:
         src = Path(input_dir) / filename
         dst = binary_dir / "walk" / filename
-        shutil.copy2(src, dst)
+        placements.append((src, dst))
 
     for filename in balanced_files['idle']:
         src = Path(input_dir) / filename
         dst = binary_dir / "idle" / filename
-        shutil.copy2(src, dst)
+        placements.append((src, dst))
 
     # Multi-class classification: actions only (jump, punch, turn_left, turn_right)
     for gesture in ['jump', 'punch', 'turn_left', 'turn_right']:
         for filename in balanced_files[gesture]:
             src = Path(input_dir) / filename
             dst = multiclass_dir / gesture / filename
-            shutil.copy2(src, dst)
+            placements.append((src, dst))
 
     # Noise detection
     for filename in balanced_files['idle']:
         src = Path(input_dir) / filename
         dst = noise_dir / "idle" / filename
-        shutil.copy2(src, dst)
+        placements.append((src, dst))
 
     # Copy noise/baseline files (from temp directory)
     for filename in balanced_files.get('noise', []):
         src = Path(input_dir) / filename
         dst = noise_dir / "baseline" / filename
-        shutil.copy2(src, dst)
-
-    for filename in balanced_files.get('baseline', []):
-        src = temp_baseline_dir / filename  # Baseline segments are in temp directory
-        dst = noise_dir / "baseline" / filename
-        shutil.copy2(src, dst)
+        placements.append((src, dst))
 
     for gesture in ['jump', 'punch', 'turn_left', 'turn_right', 'walk']:
         for filename in balanced_files[gesture]:
             src = Path(input_dir) / filename
             dst = noise_dir / "active" / filename
-            shutil.copy2(src, dst)
+            placements.append((src, dst))
+
+    # Files are placed by a thread pool (each placement is a few syscalls)
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        list(executor.map(
+            lambda placement: link_or_copy(*placement, copy_mode, preserve_metadata), placements
+        ))
+
+    # Baseline segments are moved out of the temp directory (it is deleted
+    # below, which would leave symlinks dangling)
+    for filename in balanced_files.get('baseline', []):
+        src = temp_baseline_dir / filename  # Baseline segments are in temp directory
+        dst = noise_dir / "baseline" / filename
+        os.replace(src, dst)
 
     # Clean up temp directory
     shutil.rmtree(temp_baseline_dir)
@@ -238,7 +414,7 @@ def copy_and_balance_data(input_dir, output_dir, target_samples_per_class=30):
     metadata = {
         "source_directory": str(input_dir),
         "target_samples_per_class": target_samples_per_class,
-        "original_distribution": {k: len(v) for k, v in gesture_files.items()},
+        "original_distribution": gesture_counts,
         "balanced_distribution": {k: len(v) for k, v in balanced_files.items()},
         "total_files_organized": sum(len(v) for v in balanced_files.values()),
         "binary_classification": {
@@ -276,7 +452,22 @@ def copy_and_balance_data(input_dir, output_dir, target_samples_per_class=30):
     return metadata
 
 
-def verify_csv_format(input_dir):
+def read_csv_header(filepath):
+    """
+    Read the column names of a CSV file from its first line.
+
+    Returns:
+        tuple: (set of column names, None) or (None, exception) if unreadable
+    """
+    try:
+        # utf-8-sig drops a byte order mark, as pd.read_csv does
+        with open(filepath, newline='', encoding='utf-8-sig') as f:
+            return set(next(csv.reader(f), [])), None
+    except Exception as e:
+        return None, e
+
+
+def verify_csv_format(input_dir, csv_entries=None):
     """
     Verify that CSV files have the correct format.
 
@@ -289,26 +480,20 @@ def verify_csv_format(input_dir):
                        'rot_w', 'rot_x', 'rot_y', 'rot_z', 'sensor', 'timestamp'}
 
     issues = []
-    sample_count = 0
 
-    for filename in os.listdir(input_dir):
-        if not filename.endswith('.csv'):
-            continue
+    csv_files = scan_dataset(input_dir) if csv_entries is None else csv_entries
 
-        try:
-            df = pd.read_csv(Path(input_dir) / filename)
-            columns = set(df.columns)
+    # Only the header line is needed, so every file is checked; a thread pool
+    # overlaps the file opens
+    with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+        headers = executor.map(lambda entry: read_csv_header(entry.path), csv_files)
 
-            if not expected_columns.issubset(columns):
+        for entry, (columns, error) in zip(csv_files, headers):
+            if error is not None:
+                issues.append(f"  ❌ {entry.name}: Error reading file - {error}")
+            elif not expected_columns.issubset(columns):
                 missing = expected_columns - columns
-                issues.append(f"  ❌ {filename}: Missing columns {missing}")
-
-            sample_count += 1
-            if sample_count >= 5:  # Check first 5 files
-                break
-
-        except Exception as e:
-            issues.append(f"  ❌ {filename}: Error reading file - {e}")
+                issues.append(f"  ❌ {entry.name}: Missing columns {missing}")
 
     if issues:
         print("⚠️  Found issues in some files:")
@@ -338,6 +523,19 @@ def main():
         default=30,
         help='Target number of samples per class (default: 30)'
     )
+    parser.add_argument(
+        '--copy-mode',
+        choices=['hardlink', 'symlink', 'reflink', 'copy'],
+        default='hardlink',
+        help='How files are placed in the output directory (default: hardlink, '
+             'falling back to symlink across filesystems). Use reflink or copy '
+             'if training code modifies the organized files'
+    )
+    parser.add_argument(
+        '--preserve-meta',
+        action='store_true',
+        help='With --copy-mode reflink/copy, also copy file timestamps and permissions'
+    )
     parser.add_argument(
         '--verify-only',
         action='store_true',
@@ -353,8 +551,11 @@ def main():
         print(f"❌ Error: Input directory not found: {input_dir}")
         return 1
 
+    # List the input files once for verification and organization
+    csv_entries = scan_dataset(input_dir)
+
     # Verify CSV format
-    verify_csv_format(input_dir)
+    verify_csv_format(input_dir, csv_entries)
 
     if args.verify_only:
         return 0
@@ -364,7 +565,10 @@ def main():
     print(f"📂 Output directory: {output_dir}")
 
     # Organize data
-    metadata = copy_and_balance_data(input_dir, output_dir, args.target_samples)
+    metadata = copy_and_balance_data(
+        input_dir, output_dir, args.target_samples, args.copy_mode, args.preserve_meta,
+        csv_entries=csv_entries
+    )
 
     print(f"\n📄 Metadata saved to: {output_dir / 'metadata.json'}")
     print(f"\n✨ Ready for training!")
@@ -335,9 +335,17 @@ def calibrate_walking(config, sock):
     step_packets = 0
     other_sensors = {}
 
+    last_ui_update = 0
+
     while time.time() < end_time:
-        remaining = end_time - time.time()
-        print(f"\r  > Recording... {remaining:.1f}s remaining. Steps: {len(step_timestamps)}", end="", flush=True)
+        now = time.time()
+        # Redraw the countdown at most 10x per second; writing to the terminal on
+        # every loop turn costs more than receiving the packets
+        if now - last_ui_update > 0.1:
+            remaining = end_time - now
+            sys.stdout.write("\r  > Recording... %.1fs remaining. Steps: %d" % (remaining, len(step_timestamps)))
+            sys.stdout.flush()
+            last_ui_update = now
         try:
             data, _ = sock.recvfrom(2048)
             parsed_json = json.loads(data.decode())
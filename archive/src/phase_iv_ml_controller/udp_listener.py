@@ -11,12 +11,12 @@ import os
 # Add shared_utils to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared_utils'))
 import network_utils
+from feature_extractor import extract_window_features, prepare_feature_vector  # Same features as training
+from sensor_packets import parse_binary_reading  # Binary wire format; "{" datagrams are JSON
 from zeroconf import ServiceInfo, Zeroconf
 import joblib
 import pandas as pd
 import numpy as np
-from scipy import stats
-from scipy.fft import fft
 
 # --- Global State ---
 keyboard = Controller()
@@ -40,32 +40,22 @@ ATTACK_COOLDOWN_SEC = 0.3  # Minimum time between attacks
 
 # --- NEW: The core mathematical helper function ---
 def rotate_vector_by_quaternion(vector, quat):
-    """Rotates a 3D vector by a quaternion using standard quaternion rotation formula."""
-    q_vec = [quat["x"], quat["y"], quat["z"]]
-    q_scalar = quat["w"]
+    """Rotates 3D vector(s) by quaternion(s) using standard quaternion rotation formula.
 
-    # Standard formula for vector rotation by quaternion
-    a = [
-        2 * (q_vec[1] * vector[2] - q_vec[2] * vector[1]),
-        2 * (q_vec[2] * vector[0] - q_vec[0] * vector[2]),
-        2 * (q_vec[0] * vector[1] - q_vec[1] * vector[0]),
-    ]
-
-    b = [q_scalar * a[0], q_scalar * a[1], q_scalar * a[2]]
-
-    c = [
-        q_vec[1] * a[2] - q_vec[2] * a[1],
-        q_vec[2] * a[0] - q_vec[0] * a[2],
-        q_vec[0] * a[1] - q_vec[1] * a[0],
-    ]
-
-    rotated_vector = [
-        vector[0] + b[0] + c[0],
-        vector[1] + b[1] + c[1],
-        vector[2] + b[2] + c[2],
-    ]
+    Works on a single sample or a whole window at once: vector is (3,) or (N, 3),
+    quat is a {"x", "y", "z", "w"} dict or an array in x, y, z, w order ((4,) or
+    (N, 4)). Returns an ndarray shaped like the broadcast inputs.
+    """
+    if isinstance(quat, dict):
+        quat = [quat["x"], quat["y"], quat["z"], quat["w"]]
+    vector = np.asarray(vector, dtype=float)
+    quat = np.asarray(quat, dtype=float)
+    q_vec = quat[..., :3]
+    q_scalar = quat[..., 3:]
 
-    return rotated_vector
+    # v' = v + w * a + q_vec x a, with a = 2 * (q_vec x v)
+    a = 2.0 * np.cross(q_vec, vector)
+    return vector + q_scalar * a + np.cross(q_vec, a)
 
 
 # --- Configuration Loading ---
@@ -137,96 +127,6 @@ def load_ml_models():
         return None, None, None
 
 
-def extract_window_features(window_df):
-    """Extract comprehensive features from a time window of sensor data.
-
-    This is the same function used during training.
-    """
-    features = {}
-
-    # Separate by sensor type
-    accel = window_df[window_df["sensor"] == "linear_acceleration"]
-    gyro = window_df[window_df["sensor"] == "gyroscope"]
-    rot = window_df[window_df["sensor"] == "rotation_vector"]
-
-    # ========== ACCELERATION FEATURES ==========
-    if len(accel) > 0:
-        for axis in ["accel_x", "accel_y", "accel_z"]:
-            values = accel[axis].dropna()
-
-            if len(values) > 0:
-                features[f"{axis}_mean"] = values.mean()
-                features[f"{axis}_std"] = values.std()
-                features[f"{axis}_max"] = values.max()
-                features[f"{axis}_min"] = values.min()
-                features[f"{axis}_range"] = values.max() - values.min()
-                features[f"{axis}_median"] = values.median()
-                features[f"{axis}_skew"] = stats.skew(values)
-                features[f"{axis}_kurtosis"] = stats.kurtosis(values)
-
-                threshold = values.mean() + 2 * values.std()
-                features[f"{axis}_peak_count"] = len(values[values > threshold])
-
-                if len(values) > 2:
-                    fft_vals = np.abs(fft(values))[: len(values) // 2]
-                    if len(fft_vals) > 0:
-                        features[f"{axis}_fft_max"] = fft_vals.max()
-                        features[f"{axis}_dominant_freq"] = fft_vals.argmax()
-                        features[f"{axis}_fft_mean"] = fft_vals.mean()
-
-    # ========== GYROSCOPE FEATURES ==========
-    if len(gyro) > 0:
-        for axis in ["gyro_x", "gyro_y", "gyro_z"]:
-            values = gyro[axis].dropna()
-
-            if len(values) > 0:
-                features[f"{axis}_mean"] = values.mean()
-                features[f"{axis}_std"] = values.std()
-                features[f"{axis}_max_abs"] = values.abs().max()
-                features[f"{axis}_range"] = values.max() - values.min()
-                features[f"{axis}_skew"] = stats.skew(values)
-                features[f"{axis}_kurtosis"] = stats.kurtosis(values)
-                features[f"{axis}_rms"] = np.sqrt(np.mean(values**2))
-
-                if len(values) > 2:
-                    fft_vals = np.abs(fft(values))[: len(values) // 2]
-                    if len(fft_vals) > 0:
-                        features[f"{axis}_fft_max"] = fft_vals.max()
-
-    # ========== ROTATION FEATURES ==========
-    if len(rot) > 0:
-        for axis in ["rot_x", "rot_y", "rot_z", "rot_w"]:
-            values = rot[axis].dropna()
-
-            if len(values) > 0:
-                features[f"{axis}_mean"] = values.mean()
-                features[f"{axis}_std"] = values.std()
-                features[f"{axis}_range"] = values.max() - values.min()
-
-    # ========== CROSS-SENSOR FEATURES ==========
-    if len(accel) > 0:
-        accel_mag = np.sqrt(
-            accel["accel_x"].fillna(0) ** 2
-            + accel["accel_y"].fillna(0) ** 2
-            + accel["accel_z"].fillna(0) ** 2
-        )
-        features["accel_magnitude_mean"] = accel_mag.mean()
-        features["accel_magnitude_max"] = accel_mag.max()
-        features["accel_magnitude_std"] = accel_mag.std()
-
-    if len(gyro) > 0:
-        gyro_mag = np.sqrt(
-            gyro["gyro_x"].fillna(0) ** 2
-            + gyro["gyro_y"].fillna(0) ** 2
-            + gyro["gyro_z"].fillna(0) ** 2
-        )
-        features["gyro_magnitude_mean"] = gyro_mag.mean()
-        features["gyro_magnitude_max"] = gyro_mag.max()
-        features["gyro_magnitude_std"] = gyro_mag.std()
-
-    return features
-
-
 # Load ML models
 ml_model, ml_scaler, ml_feature_names = load_ml_models()
 ML_ENABLED = ml_model is not None
@@ -242,6 +142,9 @@ CONFIDENCE_GATING_COUNT = 5  # Require N consecutive predictions for state chang
 sensor_queue = Queue(maxsize=1000)  # Collector → Predictor
 action_queue = Queue(maxsize=100)   # Predictor → Actor
 
+# Kernel receive buffer requested for the UDP socket (absorbs sensor bursts)
+SOCKET_RCVBUF_BYTES = 1 << 20
+
 
 # --- Walker Thread ---
 def walker_thread_func():
@@ -303,12 +206,21 @@ def collector_thread(sock, sensor_queue, stop_event):
     It simply reads UDP packets and dumps them into the sensor queue.
     """
     print("[COLLECTOR] Thread started")
+    # Blocking receive with timeout, so stop_event is checked at least every 0.1s
+    sock.settimeout(0.1)
     
     while not stop_event.is_set():
         try:
-            # Non-blocking receive with timeout
-            sock.settimeout(0.1)
             data, addr = sock.recvfrom(2048)
+
+            if data[:1] != b"{":
+                sensor_reading = parse_binary_reading(data)
+                if sensor_reading is not None:
+                    try:
+                        sensor_queue.put(sensor_reading, timeout=0.01)
+                    except:
+                        pass  # Queue full, drop packet
+                continue
             
             try:
                 parsed_json = json.loads(data.decode())
@@ -396,10 +308,7 @@ def predictor_thread(ml_model, ml_scaler, ml_feature_names, sensor_queue, action
                     features = extract_window_features(buffer_df)
                     
                     # Create feature vector matching training format
-                    feature_vector = pd.DataFrame([features])
-                    feature_vector = feature_vector.reindex(
-                        columns=ml_feature_names, fill_value=0
-                    )
+                    feature_vector = prepare_feature_vector(features, ml_feature_names)
                     
                     # Scale features
                     features_scaled = ml_scaler.transform(feature_vector)
@@ -522,6 +431,9 @@ def actor_thread(action_queue, sensor_queue, stop_event):
 
 # --- Main Listener Logic ---
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+# Larger kernel buffer so packet bursts survive while the collector thread waits
+# for the GIL behind the predictor threads
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_BYTES)
 sock.bind((LISTEN_IP, LISTEN_PORT))
 
 # --- Network Service Discovery Setup ---
@@ -30,6 +30,7 @@ import numpy as np
 
 # Try to import TensorFlow/Keras
 try:
+    import tensorflow as tf
     from tensorflow import keras
     KERAS_AVAILABLE = True
 except ImportError:
@@ -40,11 +41,11 @@ except ImportError:
 # ==================== CONFIGURATION ====================
 
 # Sensor types to collect
-SENSORS_TO_COLLECT = [
+SENSORS_TO_COLLECT = frozenset({
     "rotation_vector",
     "linear_acceleration",
     "gyroscope"
-]
+})
 
 # Gesture mapping
 GESTURE_NAMES = ['jump', 'punch', 'turn', 'walk', 'noise']
@@ -65,6 +66,9 @@ CONFIDENCE_THRESHOLD = 0.8  # Minimum confidence to execute action
 PREDICTION_HISTORY_SIZE = 3  # Number of recent predictions to consider
 CONSECUTIVE_PREDICTIONS_REQUIRED = 2  # Must predict same gesture N times
 
+# Kernel receive buffer requested for the UDP socket (absorbs sensor bursts)
+SOCKET_RCVBUF_BYTES = 1 << 20
+
 # Action debouncing
 COOLDOWNS = {
     'jump': 0.5,
@@ -188,6 +192,18 @@ class GestureRecognizer:
         self.model = model
         self.prediction_history = deque(maxlen=PREDICTION_HISTORY_SIZE)
         
+        # Traced once and warmed up here: calling the graph directly skips
+        # model.predict's per-call dataset setup and Python loop, which costs
+        # milliseconds out of the 20ms prediction interval
+        self.infer = None
+        if model is not None:
+            input_shape = (None,) + tuple(model.input_shape[1:])
+            self.infer = tf.function(
+                lambda x: model(x, training=False),
+                input_signature=[tf.TensorSpec(input_shape, tf.float32)]
+            )
+            self.infer(np.zeros((1,) + input_shape[1:], dtype=np.float32))
+        
     def predict(self, sensor_window):
         """Predict gesture from sensor window
         
@@ -204,7 +220,7 @@ class GestureRecognizer:
         X = sensor_window.reshape(1, sensor_window.shape[0], sensor_window.shape[1])
         
         # Predict
-        prediction = self.model.predict(X, verbose=0)
+        prediction = self.infer(X.astype(np.float32)).numpy()
         
         # Get result
         gesture_idx = np.argmax(prediction[0])
@@ -362,8 +378,9 @@ def main():
     
     # Set up UDP socket
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    # Larger kernel buffer so bursts are not dropped while a prediction runs
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_BYTES)
     sock.bind((listen_ip, listen_port))
-    sock.setblocking(False)
     
     print("\n✓ System ready!")
     print("=" * 70)
@@ -375,6 +392,10 @@ def main():
     last_prediction_time = 0
     prediction_interval = 0.02  # Predict every 20ms
     
+    # Sleep in recv until a packet arrives instead of polling a non-blocking
+    # socket; the timeout keeps predictions on schedule when no data comes in
+    sock.settimeout(prediction_interval)
+    
     try:
         while True:
             # Receive sensor data
@@ -387,7 +408,7 @@ def main():
                     values = parsed.get("values", {})
                     sensor_buffer.add_reading(sensor_type, values)
                 
-            except (BlockingIOError, json.JSONDecodeError, KeyError):
+            except (socket.timeout, json.JSONDecodeError, KeyError):
                 pass
             
             # Predict at regular intervals
@@ -419,9 +440,6 @@ def main():
                                 stop_walking()
                 
                 last_prediction_time = current_time
-            
-            # Small sleep to prevent CPU spinning
-            time.sleep(0.001)
     
     except KeyboardInterrupt:
         print("\n\n⚠️  Interrupted by user")
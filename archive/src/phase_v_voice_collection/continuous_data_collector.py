@@ -45,6 +45,7 @@ Usage:
 """
 
 import socket
+import selectors
 import json
 import time
 import csv
@@ -57,10 +58,27 @@ import sys
 # Add shared_utils to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared_utils'))
 import network_utils
+from sensor_packets import unpack_binary_packet
 import sounddevice as sd
 import numpy as np
 import wave
 
+# Per-packet JSON decoding (and metadata encoding): orjson parses bytes (and
+# memoryviews) directly in C, stdlib json is the fallback. orjson.JSONDecodeError
+# subclasses json.JSONDecodeError.
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps_indented(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def json_loads(data):
+        return json.loads(bytes(data))  # stdlib json rejects memoryview
+
+    def json_dumps_indented(obj):
+        return json.dumps(obj, indent=2).encode()
+
 # ==================== CONFIGURATION ====================
 
 # Sensor types to collect
@@ -70,6 +88,34 @@ SENSORS_TO_COLLECT = [
     "gyroscope",  # Angular velocity
 ]
 
+# CSV columns written for each sensor type, in x, y, z, w order
+SENSOR_FIELDS = {
+    "rotation_vector": ("rot_x", "rot_y", "rot_z", "rot_w"),
+    "linear_acceleration": ("accel_x", "accel_y", "accel_z"),
+    "gyroscope": ("gyro_x", "gyro_y", "gyro_z"),
+}
+
+# sensor_data.csv header (alphabetical, matching previously recorded sessions)
+CSV_FIELDNAMES = sorted(
+    ["timestamp", "sensor"]
+    + [field for fields in SENSOR_FIELDS.values() for field in fields]
+)
+
+# Row positions in CSV_FIELDNAMES, so records are stored as ready-to-write rows
+TIMESTAMP_INDEX = CSV_FIELDNAMES.index("timestamp")
+SENSOR_INDEX = CSV_FIELDNAMES.index("sensor")
+SENSOR_FIELD_INDICES = {
+    sensor_type: tuple(CSV_FIELDNAMES.index(field) for field in fields)
+    for sensor_type, fields in SENSOR_FIELDS.items()
+}
+
+# Kernel receive buffer requested for the UDP socket. Absorbs packet bursts while
+# the loop is busy (status output, audio callbacks) instead of dropping them.
+SOCKET_RCVBUF_BYTES = 4 * 1024 * 1024
+
+# Longest the recording loop waits for packets before re-checking its deadline
+RECEIVE_TIMEOUT_SEC = 0.05
+
 # Gesture durations (seconds)
 GESTURE_DURATIONS = {
     "jump": 0.3,
@@ -82,6 +128,10 @@ GESTURE_DURATIONS = {
 # Default recording duration
 DEFAULT_DURATION_SEC = 600  # 10 minutes
 
+# Extra audio capacity reserved beyond duration_sec, covering the frames that
+# arrive while the stream is being stopped
+AUDIO_BUFFER_SLACK_SEC = 5
+
 
 # ANSI Color codes
 class Colors:
@@ -94,6 +144,34 @@ class Colors:
     BOLD = "\033[1m"
 
 
+# ==================== PACKET DECODING ====================
+
+
+def parse_packet(data):
+    """
+    Decode a sensor datagram (binary or legacy JSON) from bytes or a memoryview
+
+    Returns:
+        tuple: (sensor_type, values) or None if the sensor is not collected
+    """
+    if data[:1] == b"{":
+        parsed = json_loads(data)
+        sensor_type = parsed.get("sensor")
+        if sensor_type not in SENSOR_FIELDS:
+            return None
+        vals = parsed.get("values")
+        if vals is None:
+            return sensor_type, ()
+        return sensor_type, tuple(vals.get(axis, 0) for axis in "xyzw")
+
+    # Binary wire format: see shared_utils/sensor_packets.py
+    packet = unpack_binary_packet(data)
+    if packet is None:
+        return None
+    sensor_type, _, values = packet
+    return sensor_type, values
+
+
 # ==================== DATA STRUCTURES ====================
 
 
@@ -128,17 +206,27 @@ class ContinuousDataCollector:
         # Recording state
         self.recording = False
         self.start_time = None
-        self.sensor_data = []
+        # sensor_data.csv is written row by row while recording (see _drain_socket)
+        self.sensor_file = None
+        self.sensor_writer = None
+        self.sensor_data_points = 0
+        self.last_sensor_timestamp = 0
 
         # Network
         self.sock = None
         self.config = None
+        # Reused for every datagram so the recording loop allocates no bytes objects
+        self.receive_buffer = bytearray(4096)
+        self.receive_view = memoryview(self.receive_buffer)
 
         # Threading
         self.stop_event = threading.Event()
 
-        # Audio recording
-        self.audio_data = []
+        # Audio recording: audio_callback copies each chunk into a buffer sized
+        # for the whole session (see _allocate_audio_buffer)
+        self.audio_buffer = None
+        self.audio_frames = 0
+        self.audio_chunks = 0
         self.audio_sample_rate = 44100  # 44.1kHz for quality audio (CD quality)
         self.whisper_sample_rate = 16000  # Downsample to 16kHz for Whisper later
         self.audio_file = None
@@ -168,6 +256,17 @@ class ContinuousDataCollector:
         listen_port = self.config["network"]["listen_port"]
 
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_BYTES)
+        # Linux reports double the usable size and caps requests at net.core.rmem_max
+        rcvbuf = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        print(f"{Colors.GREEN}✓ Socket receive buffer: {rcvbuf // 1024} KiB{Colors.RESET}")
+        if rcvbuf < SOCKET_RCVBUF_BYTES:
+            print(
+                f"{Colors.YELLOW}⚠️  Receive buffer capped by the OS - packets may drop during pauses{Colors.RESET}"
+            )
+            print(
+                f"{Colors.YELLOW}   Linux: sudo sysctl -w net.core.rmem_max=12582912{Colors.RESET}"
+            )
         try:
             self.sock.bind((listen_ip, listen_port))
             self.sock.setblocking(False)
@@ -221,10 +320,9 @@ class ContinuousDataCollector:
 
             try:
                 data, _ = self.sock.recvfrom(4096)
-                parsed = json.loads(data.decode())
 
                 # Count ANY valid sensor packet
-                if "sensor" in parsed and parsed["sensor"] in SENSORS_TO_COLLECT:
+                if parse_packet(data) is not None:
                     packet_count += 1
 
                     # SUCCESS after receiving 3+ packets (more reliable)
@@ -279,12 +377,86 @@ class ContinuousDataCollector:
 
     def _flush_socket(self):
         """Clear any pending packets in socket buffer"""
+        # Reads into the reusable receive buffer, so discarding allocates nothing
+        recv_into = self.sock.recv_into
+        receive_buffer = self.receive_buffer
         try:
             while True:
-                self.sock.recvfrom(4096)
+                recv_into(receive_buffer)
         except BlockingIOError:
             pass  # Buffer is empty
 
+    def _drain_socket(self):
+        """
+        Write every packet currently queued on the socket to sensor_data.csv.
+
+        Called when the socket is readable, so a burst of packets costs one
+        wake-up and one deadline check rather than one per packet. Each row is
+        stamped with its own arrival time. Returns the number of rows stored.
+        """
+        # Bound once per drain: the loop body runs for every packet
+        recv_into = self.sock.recv_into
+        receive_buffer = self.receive_buffer
+        receive_view = self.receive_view
+        monotonic = time.monotonic
+        writerow = self.sensor_writer.writerow
+        start_time = self.start_time
+
+        rows_added = 0
+        while True:
+            try:
+                nbytes = recv_into(receive_buffer)
+            except BlockingIOError:
+                break
+
+            try:
+                packet = parse_packet(receive_view[:nbytes])
+            except (json.JSONDecodeError, KeyError):
+                continue  # Malformed packet
+            if packet is None:
+                continue
+
+            # Create row in CSV_FIELDNAMES order (empty cells for other sensors)
+            sensor_type, values = packet
+            row = [""] * len(CSV_FIELDNAMES)
+            row[TIMESTAMP_INDEX] = monotonic() - start_time
+            row[SENSOR_INDEX] = sensor_type
+            for index, value in zip(SENSOR_FIELD_INDICES[sensor_type], values):
+                row[index] = value
+
+            writerow(row)
+            rows_added += 1
+
+        if rows_added:
+            self.sensor_data_points += rows_added
+            self.last_sensor_timestamp = row[TIMESTAMP_INDEX]
+        return rows_added
+
+    def _open_sensor_file(self):
+        """Create sensor_data.csv and write its header; rows follow as they arrive"""
+        sensor_file = os.path.join(self.output_dir, "sensor_data.csv")
+        # 1 MiB buffer: rows reach the disk in a few large writes, not per packet
+        self.sensor_file = open(sensor_file, "w", newline="", buffering=1 << 20)
+        self.sensor_writer = csv.writer(self.sensor_file)
+        self.sensor_writer.writerow(CSV_FIELDNAMES)
+
+    def _close_sensor_file(self):
+        """Flush sensor_data.csv to disk and close it (no-op if not open)"""
+        if self.sensor_file is None:
+            return
+        self.sensor_file.flush()
+        os.fsync(self.sensor_file.fileno())
+        self.sensor_file.close()
+        self.sensor_file = None
+        self.sensor_writer = None
+
+    def discard_sensor_data(self):
+        """Delete the streamed sensor_data.csv of a recording that is not kept"""
+        self._close_sensor_file()
+        sensor_file = os.path.join(self.output_dir, "sensor_data.csv")
+        if os.path.exists(sensor_file):
+            os.remove(sensor_file)
+
     def display_instructions(self):
         """Display recording instructions"""
         instructions = f"""
@@ -334,12 +506,27 @@ class ContinuousDataCollector:
 """
         print(instructions)
 
+    def _allocate_audio_buffer(self, channels):
+        """Reserve room for the full recording so the callback never reallocates"""
+        capacity = int((self.duration_sec + AUDIO_BUFFER_SLACK_SEC) * self.audio_sample_rate)
+        self.audio_buffer = np.empty((capacity, channels), dtype=np.float32)
+        self.audio_frames = 0
+        self.audio_chunks = 0
+
     def audio_callback(self, indata, frames, time_info, status):
         """Callback for audio stream - captures audio chunks"""
         if status:
             print(f"\n{Colors.YELLOW}Audio status: {status}{Colors.RESET}")
-        # Store audio data
-        self.audio_data.append(indata.copy())
+        # Store audio data at the write index, doubling the buffer if a long
+        # stop overruns the reserved slack
+        end = self.audio_frames + frames
+        if end > len(self.audio_buffer):
+            grown = np.empty((max(end, 2 * len(self.audio_buffer)), indata.shape[1]), dtype=np.float32)
+            grown[:self.audio_frames] = self.audio_buffer[:self.audio_frames]
+            self.audio_buffer = grown
+        self.audio_buffer[self.audio_frames:end] = indata
+        self.audio_frames = end
+        self.audio_chunks += 1
 
     def record_sensor_data(self):
         """Main recording loop for sensor data and audio"""
@@ -348,15 +535,25 @@ class ContinuousDataCollector:
             f"{Colors.YELLOW}🎤 Audio recording active - speak commands naturally!{Colors.RESET}\n"
         )
 
+        # Drop packets that queued up during the pre-recording countdown so
+        # they are not stamped as if they arrived at t=0
+        self._flush_socket()
+
+        # Stream rows to disk during the session instead of holding them all
+        # in memory until save_data()
+        self._open_sensor_file()
+
         self.recording = True
-        self.start_time = time.time()
+        # Monotonic clock: immune to wall-clock adjustments mid-recording
+        self.start_time = time.monotonic()
         recording_end = self.start_time + self.duration_sec
 
         last_status_update = 0
-        data_points = 0
-        last_data_time = time.time()
+        last_warning = 0
+        last_data_time = self.start_time
 
         # Start audio recording in separate thread
+        self._allocate_audio_buffer(channels=1)
         audio_stream = sd.InputStream(
             samplerate=self.audio_sample_rate,
             channels=1,
@@ -365,70 +562,50 @@ class ContinuousDataCollector:
         )
         audio_stream.start()
 
-        while time.time() < recording_end and not self.stop_event.is_set():
-            elapsed = time.time() - self.start_time
-            remaining = recording_end - time.time()
+        # Sleep in the kernel until packets arrive, then drain the whole backlog
+        # at once; the short timeout keeps deadline/stop checks responsive
+        selector = selectors.DefaultSelector()
+        selector.register(self.sock, selectors.EVENT_READ)
+
+        while not self.stop_event.is_set():
+            # One clock read per wake-up; packet timestamps take their own
+            now = time.monotonic()
+            if now >= recording_end:
+                break
+            elapsed = now - self.start_time
+            remaining = recording_end - now
             progress_pct = (elapsed / self.duration_sec) * 100
 
             # Update status display
-            if time.time() - last_status_update > 1.0:
-                self._display_status(elapsed, remaining, progress_pct, data_points)
-                last_status_update = time.time()
+            if now - last_status_update > 1.0:
+                self._display_status(
+                    elapsed, remaining, progress_pct, self.sensor_data_points
+                )
+                last_status_update = now
 
             # Receive sensor data
-            try:
-                data, addr = self.sock.recvfrom(4096)
-                parsed = json.loads(data.decode())
-                sensor_type = parsed.get("sensor")
-
-                if sensor_type in SENSORS_TO_COLLECT:
-                    last_data_time = time.time()
-
-                    # Create record
-                    record = {
-                        "timestamp": time.time() - self.start_time,
-                        "sensor": sensor_type,
-                    }
-
-                    # Flatten sensor values
-                    if "values" in parsed:
-                        vals = parsed["values"]
-                        if sensor_type == "rotation_vector":
-                            record["rot_x"] = vals.get("x", 0)
-                            record["rot_y"] = vals.get("y", 0)
-                            record["rot_z"] = vals.get("z", 0)
-                            record["rot_w"] = vals.get("w", 0)
-                        elif sensor_type == "linear_acceleration":
-                            record["accel_x"] = vals.get("x", 0)
-                            record["accel_y"] = vals.get("y", 0)
-                            record["accel_z"] = vals.get("z", 0)
-                        elif sensor_type == "gyroscope":
-                            record["gyro_x"] = vals.get("x", 0)
-                            record["gyro_y"] = vals.get("y", 0)
-                            record["gyro_z"] = vals.get("z", 0)
-
-                    self.sensor_data.append(record)
-                    data_points += 1
-
-            except (BlockingIOError, json.JSONDecodeError, KeyError):
-                pass
+            if selector.select(timeout=min(RECEIVE_TIMEOUT_SEC, remaining)):
+                if self._drain_socket():
+                    last_data_time = time.monotonic()
 
-            # Check connection
-            if time.time() - last_data_time > 2.0:
+            # Check connection (warn at most once per second, not every loop)
+            if now - last_data_time > 2.0 and now - last_warning > 1.0:
+                last_warning = now
                 print(
                     f"\r{Colors.RED}⚠️  WARNING: No data received for 2 seconds! Check watch connection.{Colors.RESET}"
                 )
 
+        selector.close()
         self.recording = False
         audio_stream.stop()
         audio_stream.close()
 
         print(f"\n\n{Colors.GREEN}✓ Recording complete!{Colors.RESET}")
         print(
-            f"{Colors.BLUE}Captured {len(self.sensor_data)} sensor data points{Colors.RESET}"
+            f"{Colors.BLUE}Captured {self.sensor_data_points} sensor data points{Colors.RESET}"
         )
         print(
-            f"{Colors.BLUE}Recorded {len(self.audio_data)} audio chunks{Colors.RESET}"
+            f"{Colors.BLUE}Recorded {self.audio_chunks} audio chunks{Colors.RESET}"
         )
 
     def _display_status(self, elapsed, remaining, progress_pct, data_points):
@@ -446,7 +623,7 @@ class ContinuousDataCollector:
         data_rate = data_points / elapsed if elapsed > 0 else 0
 
         # Audio chunks
-        audio_chunks = len(self.audio_data)
+        audio_chunks = self.audio_chunks
 
         # Display
         status = f"\r⏱️  {elapsed_str}/{total_str} [{bar}] {progress_pct:.0f}% | "
@@ -464,28 +641,22 @@ class ContinuousDataCollector:
 
         # Use simpler filenames inside the session directory
         # (timestamp is already in the directory name)
+        # sensor_data.csv was streamed during recording; finish it here
         sensor_file = os.path.join(self.output_dir, "sensor_data.csv")
-        if self.sensor_data:
-            fieldnames = set()
-            for record in self.sensor_data:
-                fieldnames.update(record.keys())
-            fieldnames = sorted(list(fieldnames))
-
-            with open(sensor_file, "w", newline="") as csvfile:
-                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                writer.writeheader()
-                writer.writerows(self.sensor_data)
-
+        if self.sensor_data_points:
+            self._close_sensor_file()
             print(f"{Colors.GREEN}✓ Sensor data saved: {sensor_file}{Colors.RESET}")
+        else:
+            self.discard_sensor_data()  # Header only
 
         # Save audio data as WAV file
         # Use clean filenames (timestamp is in directory name)
         audio_file = os.path.join(self.output_dir, "audio.wav")
         audio_file_whisper = os.path.join(self.output_dir, "audio_16k.wav")
 
-        if self.audio_data:
-            # Concatenate all audio chunks
-            audio_array = np.concatenate(self.audio_data, axis=0)
+        if self.audio_frames:
+            # Recorded frames (a view, no copy)
+            audio_array = self.audio_buffer[:self.audio_frames]
 
             # Save high-quality version (44.1kHz) - sounds natural
             with wave.open(audio_file, "wb") as wf:
@@ -539,12 +710,8 @@ class ContinuousDataCollector:
 
         # Save session metadata
         metadata_file = os.path.join(self.output_dir, "metadata.json")
-        actual_duration = self.sensor_data[-1]["timestamp"] if self.sensor_data else 0
-        audio_duration = (
-            len(np.concatenate(self.audio_data)) / self.audio_sample_rate
-            if self.audio_data
-            else 0
-        )
+        actual_duration = self.last_sensor_timestamp
+        audio_duration = self.audio_frames / self.audio_sample_rate
 
         metadata = {
             "session_name": self.session_name,
@@ -552,14 +719,14 @@ class ContinuousDataCollector:
             "duration_sec": self.duration_sec,
             "actual_duration_sec": actual_duration,
             "audio_duration_sec": audio_duration,
-            "sensor_data_points": len(self.sensor_data),
+            "sensor_data_points": self.sensor_data_points,
             "audio_sample_rate": self.audio_sample_rate,
-            "audio_chunks": len(self.audio_data),
+            "audio_chunks": self.audio_chunks,
             "sensors_collected": SENSORS_TO_COLLECT,
         }
 
-        with open(metadata_file, "w") as f:
-            json.dump(metadata, f, indent=2)
+        with open(metadata_file, "wb") as f:
+            f.write(json_dumps_indented(metadata))
 
         print(f"{Colors.GREEN}✓ Metadata saved: {metadata_file}{Colors.RESET}")
 
@@ -570,7 +737,7 @@ class ContinuousDataCollector:
 ## Recording Information
 - **Date:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 - **Duration:** {actual_duration:.1f}s ({actual_duration/60:.1f} minutes)
-- **Sensor Data Points:** {len(self.sensor_data)}
+- **Sensor Data Points:** {self.sensor_data_points}
 - **Audio Duration:** {audio_duration:.1f}s
 
 ## Files in This Session
@@ -624,9 +791,9 @@ Generated by continuous_data_collector.py
         print(f"  {Colors.BLUE}• Sensor duration: {actual_duration:.1f}s{Colors.RESET}")
         print(f"  {Colors.BLUE}• Audio duration: {audio_duration:.1f}s{Colors.RESET}")
         print(
-            f"  {Colors.BLUE}• Sensor data points: {len(self.sensor_data)}{Colors.RESET}"
+            f"  {Colors.BLUE}• Sensor data points: {self.sensor_data_points}{Colors.RESET}"
         )
-        print(f"  {Colors.BLUE}• Audio chunks: {len(self.audio_data)}{Colors.RESET}")
+        print(f"  {Colors.BLUE}• Audio chunks: {self.audio_chunks}{Colors.RESET}")
 
         print(f"\n{Colors.BOLD}🎤 Next Steps:{Colors.RESET}")
         print(f"  1. Run Whisper on: {self.output_dir}/audio_16k.wav")
@@ -636,6 +803,7 @@ Generated by continuous_data_collector.py
 
     def cleanup(self):
         """Clean up resources"""
+        self._close_sensor_file()
         if self.sock:
             self.sock.close()
 
@@ -731,12 +899,14 @@ def main():
 
     except KeyboardInterrupt:
         print(f"\n\n{Colors.YELLOW}⚠️  Recording interrupted by user{Colors.RESET}")
-        if collector.sensor_data:
+        if collector.sensor_data_points:
             save = input(
                 f"{Colors.YELLOW}Save partial recording? (y/n): {Colors.RESET}"
             )
             if save.lower() == "y":
                 collector.save_data()
+            else:
+                collector.discard_sensor_data()
 
     except Exception as e:
         print(f"\n{Colors.RED}❌ ERROR: {e}{Colors.RESET}")
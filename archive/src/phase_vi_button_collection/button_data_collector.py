@@ -196,14 +196,23 @@ class ButtonDataCollector:
             self.handle_label_event(msg, addr)
         elif msg.get('sensor'):
             # Sensor data - parse and buffer
-            self.last_watch_data = time.time()
+            # One clock read per packet, shared by every use below
+            now = time.time()
+            self.last_watch_data = now
 
             # Parse sensor values (handle both formats)
             # Note: Each packet contains ONE sensor type, not all three!
             # We store each sensor reading separately with its timestamp
             values = msg.get('values', {})
             sensor_type = msg.get('sensor', 'unknown')
-            timestamp = msg.get('timestamp_ns', msg.get('timestamp', time.time() * 1e9))
+            # Prefer the watch's own timestamp; the local clock is only a fallback
+            # (a nested msg.get default would read the clock for every packet)
+            if 'timestamp_ns' in msg:
+                timestamp = msg['timestamp_ns']
+            elif 'timestamp' in msg:
+                timestamp = msg['timestamp']
+            else:
+                timestamp = now * 1e9
 
             # Initialize all sensor values to 0 (only the relevant sensor will have data)
             accel_x = accel_y = accel_z = 0.0
@@ -259,7 +268,7 @@ class ButtonDataCollector:
 
             # Capture baseline noise (first 30 seconds after noise_start_time)
             if not self.baseline_noise_captured and self.noise_start_time:
-                elapsed = time.time() - self.noise_start_time
+                elapsed = now - self.noise_start_time
                 if elapsed <= self.baseline_noise_duration:
                     # Still in baseline capture window
                     self.noise_buffer.append(sensor_entry)
@@ -315,7 +315,7 @@ class DataCollectionDashboard:
                                 print(f"   ✅ Watch connected from {addr[0]}")
                             self.last_watch_data = time.time()
                             self.sensor_data_count += 1
-                            self.sensor_rate_window.append(time.time())
+                            self.sensor_rate_window.append(self.last_watch_data)
 
                         elif msg.get("type") == "label_event":
                             # Label event from phone
@@ -324,7 +324,7 @@ class DataCollectionDashboard:
                                 print(f"   ✅ Phone connected from {addr[0]}")
                             self.last_phone_data = time.time()
                             self.label_event_count += 1
-                            self.label_rate_window.append(time.time())
+                            self.label_rate_window.append(self.last_phone_data)
 
                         # Check if both are ready
                         if (
@@ -407,8 +407,10 @@ class DataCollectionDashboard:
             self.handle_label_event(msg, addr)
         elif msg.get("sensor"):
             # Sensor data
-            self.last_watch_data = time.time()
-            self.sensor_rate_window.append(time.time())
+            # One clock read per packet, shared by every use below
+            now = time.time()
+            self.last_watch_data = now
+            self.sensor_rate_window.append(now)
 
             # Parse sensor values
             values = msg.get("values", {})
@@ -462,9 +464,14 @@ class DataCollectionDashboard:
                 rot_z = msg.get("rot_z", 0.0)
                 rot_w = msg.get("rot_w", 1.0)
 
-            self.latest_timestamp = msg.get(
-                "timestamp_ns", msg.get("timestamp", time.time() * 1e9)
-            )
+            # Prefer the watch's own timestamp; the local clock is only a fallback
+            # (a nested msg.get default would read the clock for every packet)
+            if "timestamp_ns" in msg:
+                self.latest_timestamp = msg["timestamp_ns"]
+            elif "timestamp" in msg:
+                self.latest_timestamp = msg["timestamp"]
+            else:
+                self.latest_timestamp = now * 1e9
 
             sensor_entry = {
                 "timestamp": self.latest_timestamp,
@@ -486,7 +493,7 @@ class DataCollectionDashboard:
 
             # Baseline noise capture
             if not self.baseline_noise_captured and self.noise_start_time:
-                elapsed = time.time() - self.noise_start_time
+                elapsed = now - self.noise_start_time
                 if elapsed <= self.baseline_noise_duration:
                     self.noise_buffer.append(sensor_entry)
                 else:
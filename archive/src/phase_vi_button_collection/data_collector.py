@@ -16,6 +16,8 @@ Command-Line Arguments:
     --samples N                     Number of samples per gesture (default: 40)
     --duration SEC                  Recording duration for snippet mode in seconds (default: 2.5)
     --continuous-duration MIN       Recording duration for continuous mode in minutes (default: 2.5)
+    --format {csv,parquet}          One CSV per recording (default) or one Parquet file per session
+    --no-label-columns              Keep gesture/stance/sample labels only in session_metadata.json
     --session-id ID                 Use specific session ID (for resuming)
     --list-gestures                 List all available gestures and exit
 
@@ -31,20 +33,60 @@ Examples:
 
     # Resume a specific session
     python data_collector.py --session-id 20251014_143052 --gestures turn
+
+    # Append all recordings to a single Parquet file
+    python data_collector.py --format parquet
 """
 
 import socket
 import json
 import time
-import csv
 import os
 import argparse
+import operator
+import queue
+import selectors
+import threading
 from datetime import datetime
+from types import MappingProxyType
 from collections import deque
 import sys
+import numpy as np
 # Add shared_utils to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared_utils'))
 import network_utils
+from sensor_packets import unpack_binary_packet
+
+# Per-packet JSON decoding (and metadata encoding): orjson parses bytes (and
+# memoryviews) directly in C, stdlib json is the fallback
+try:
+    import orjson
+    json_loads = orjson.loads
+
+    def json_dumps_indented(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    def json_loads(data):
+        return json.loads(bytes(data))  # stdlib json rejects memoryview
+
+    def json_dumps_indented(obj):
+        return json.dumps(obj, indent=2).encode()
+
+# Optional MessagePack packet decoding: the same {"sensor", "values"} map as the
+# JSON payload, about half the bytes. Detected per datagram by its leading byte.
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+# Optional session-level Parquet output (--format parquet)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
 
 # ==================== CONFIGURATION ====================
@@ -56,6 +98,10 @@ SENSORS_TO_COLLECT = [
     "gyroscope"            # Angular velocity
 ]
 
+# Sensor type -> its index in SENSORS_TO_COLLECT (the code stored per packet and
+# the binary sensor_id). The list stays ordered for those codes and the metadata.
+SENSOR_CODES = {sensor_type: code for code, sensor_type in enumerate(SENSORS_TO_COLLECT)}
+
 # Data collection parameters
 RECORDING_DURATION_SEC = 2.5  # Duration to record each gesture (snippet mode)
 COUNTDOWN_SEC = 1  # Countdown before recording starts
@@ -65,9 +111,51 @@ NOISE_SAMPLES = 80  # Oversample NOISE for robustness (2x target gestures)
 # Continuous recording parameters (for state-based gestures like WALK)
 CONTINUOUS_RECORDING_DURATION_MIN = 2.5  # Duration for continuous gestures (minutes)
 
+# Expected packet rate across all three sensors (~50 Hz each at SENSOR_DELAY_GAME),
+# used to preallocate recording buffers
+EXPECTED_SAMPLE_RATE_HZ = 150
+
 # Connection monitoring
 CONNECTION_TIMEOUT_SEC = 2.0  # Time without data before connection lost
 
+# Datagrams use the binary wire format in shared_utils/sensor_packets.py (the
+# sensor_id order matches SENSORS_TO_COLLECT). Ones starting with "{" are still
+# parsed as the legacy JSON payload, and ones starting with a MessagePack fixmap
+# marker (0x80-0x8f) as MessagePack.
+
+# Recordings waiting for the background writer; put() blocks once this many are pending
+WRITE_QUEUE_SIZE = 8
+
+# Continuous recordings are handed to the writer in segments of this length, so
+# the CSV grows during the recording and an interrupted session keeps its data
+STREAM_SEGMENT_SEC = 10.0
+
+# UDP receive buffer: large enough to hold a few seconds of all three sensors
+# while the script is blocked on input() prompts or countdown sleeps
+SOCKET_RCVBUF_BYTES = 4 * 1024 * 1024
+
+# Fixed column layout for Parquet output: every recording of a session is appended
+# as one row group, so snippet (sample) and continuous (collection_mode) rows share it
+if PYARROW_AVAILABLE:
+    PARQUET_SCHEMA = pa.schema([
+        ("timestamp", pa.float64()),
+        ("sensor", pa.string()),
+        ("gesture", pa.string()),
+        ("stance", pa.string()),
+        ("sample", pa.int64()),
+        ("collection_mode", pa.string()),
+        ("rot_x", pa.float64()),
+        ("rot_y", pa.float64()),
+        ("rot_z", pa.float64()),
+        ("rot_w", pa.float64()),
+        ("accel_x", pa.float64()),
+        ("accel_y", pa.float64()),
+        ("accel_z", pa.float64()),
+        ("gyro_x", pa.float64()),
+        ("gyro_y", pa.float64()),
+        ("gyro_z", pa.float64()),
+    ])
+
 # ANSI Color codes for terminal
 class Colors:
     GREEN = '\033[92m'
@@ -77,6 +165,23 @@ class Colors:
     RESET = '\033[0m'
     BOLD = '\033[1m'
 
+# Live status lines, built once: remaining s, connection, points, rate (snippet) and
+# elapsed s, total s, progress bar, percent, connection, points, rate (continuous)
+SNIPPET_STATUS_TEMPLATE = (
+    f"\r  ⏱️  {Colors.BOLD}Recording: %.1fs{Colors.RESET} | %s | "
+    f"{Colors.BLUE}📊 %d pts (%.0f pts/s){Colors.RESET}"
+)
+CONTINUOUS_STATUS_TEMPLATE = (
+    f"\r  ⏱️  {Colors.BOLD}%ds / %ds{Colors.RESET} [%s] %.0f%% | %s | "
+    f"{Colors.BLUE}📊 %d pts (%.0f pts/s){Colors.RESET}"
+)
+
+CONNECTED_STATUS = f"{Colors.GREEN}✓ CONNECTED{Colors.RESET}"
+CONNECTION_LOST_STATUS = f"{Colors.RED}❌ CONNECTION LOST{Colors.RESET}"
+
+# Seconds between live status line refreshes (~4 Hz is plenty for a human)
+STATUS_UPDATE_INTERVAL_SEC = 0.25
+
 # ==================== STANCE DEFINITIONS ====================
 
 STANCES = {
@@ -258,20 +363,254 @@ The goal: teach the model to recognize and REJECT everything except
 the 4 sacred gestures.
         """,
     },
-}# ==================== DATA COLLECTION CLASS ====================
+}
+
+# Stance and gesture tables are fixed configuration: expose them read-only
+STANCES = MappingProxyType({key: MappingProxyType(stance) for key, stance in STANCES.items()})
+GESTURES = MappingProxyType({key: MappingProxyType(gesture) for key, gesture in GESTURES.items()})
+
+# Box borders and the per-stance banners, built once instead of on every prompt
+BOX_TOP = "╔" + "═" * 68 + "╗"
+BOX_BOTTOM = "╚" + "═" * 68 + "╝"
+STANCE_BANNERS = MappingProxyType({
+    key: "\n".join([
+        "\n" + BOX_TOP,
+        f"║  {Colors.BOLD}{Colors.YELLOW}Please adopt: {stance['name'].upper():<50}{Colors.RESET} ║",
+        BOX_BOTTOM,
+        f"{Colors.BLUE}{stance['description']}{Colors.RESET}",
+    ])
+    for key, stance in STANCES.items()
+})
+
+# ==================== RECORDING BUFFER ====================
+
+# Numeric columns held per packet; each sensor fills its own slice of a row
+VALUE_COLUMNS = (
+    "timestamp",
+    "rot_x", "rot_y", "rot_z", "rot_w",
+    "accel_x", "accel_y", "accel_z",
+    "gyro_x", "gyro_y", "gyro_z",
+)
+
+# Every column a recording can carry, in CSV header order (alphabetical, matching
+# earlier sessions). Snippet recordings have "sample", continuous ones "collection_mode".
+FIELDNAMES = sorted(VALUE_COLUMNS + ("sensor", "gesture", "stance", "sample", "collection_mode"))
+
+# Per-sensor dispatch table: sensor type -> (first column index in VALUE_COLUMNS,
+# JSON value keys in column order). One dict lookup replaces an if/elif chain.
+SENSOR_COLUMNS = {
+    "rotation_vector": (1, ("x", "y", "z", "w")),
+    "linear_acceleration": (5, ("x", "y", "z")),
+    "gyroscope": (8, ("x", "y", "z")),
+}
+
+# JSON "values" dict -> axis tuple in SENSOR_COLUMNS order, as one C-level call
+# per packet (raises KeyError if an axis is missing)
+SENSOR_EXTRACTORS = {
+    sensor_type: operator.itemgetter(*axes) for sensor_type, (_, axes) in SENSOR_COLUMNS.items()
+}
+
+# Everything RecordingBuffer.append needs per sensor, resolved once for the fixed
+# sensor set: (sensor code, value column slice, number of axes)
+SENSOR_SLOTS = {
+    sensor_type: (SENSOR_CODES[sensor_type], slice(start, start + len(axes)), len(axes))
+    for sensor_type, (start, axes) in SENSOR_COLUMNS.items()
+}
+
+
+def parse_packet(data):
+    """
+    Decode one sensor datagram (binary, MessagePack or legacy JSON) from bytes
+    or a memoryview.
+
+    Returns (sensor_type, event_time, values) for collected sensors and None
+    otherwise. event_time is the watch's sensor event time in seconds (JSON and
+    MessagePack: "timestamp_ns"), or None if the packet has none. values holds
+    the sensor's axes in SENSOR_COLUMNS order (binary packets always carry
+    four), or None for a map packet without "values".
+    Raises ValueError on a malformed JSON/MessagePack payload and KeyError if
+    it is missing one of its sensor's axes.
+    """
+    if data[:1] == b"{":
+        parsed = json_loads(data)
+    elif MSGPACK_AVAILABLE and len(data) and 0x80 <= data[0] <= 0x8f:
+        parsed = msgpack.unpackb(data)
+    else:
+        parsed = None
+
+    if parsed is not None:
+        sensor_type = parsed.get("sensor")
+        extract = SENSOR_EXTRACTORS.get(sensor_type)
+        if extract is None:
+            return None
+        event_ns = parsed.get("timestamp_ns")
+        event_time = event_ns * 1e-9 if event_ns is not None else None
+        vals = parsed.get("values")
+        if vals is None:
+            return sensor_type, event_time, None
+        return sensor_type, event_time, extract(vals)
+
+    return unpack_binary_packet(data)
+
+
+class RecordingBuffer:
+    """
+    Preallocated column store for a single recording.
+
+    Sensor values are written by index into a float64 array (NaN where a sensor
+    does not report a column) instead of building one dict per packet. Capacity
+    doubles if a recording outlasts the preallocated size. Label columns
+    (gesture, stance, ...) are constant per recording and only added on export.
+    """
+
+    def __init__(self, capacity):
+        self.values = np.full((capacity, len(VALUE_COLUMNS)), np.nan)
+        self.sensor_codes = np.zeros(capacity, dtype=np.uint8)
+        self.size = 0
+        self.labels = {}
+
+    def __len__(self):
+        return self.size
+
+    def reset(self, labels, capacity=0):
+        """Start a new recording with the given label columns."""
+        if capacity > len(self.values):
+            self.__init__(capacity)
+        else:
+            self.values[:self.size] = np.nan
+        self.size = 0
+        self.labels = labels
+
+    def append(self, timestamp, sensor_type, values):
+        """Store one packet; values is its axis sequence from parse_packet (or None)."""
+        size = self.size
+        if size == len(self.values):
+            self._grow()
+        code, columns, width = SENSOR_SLOTS[sensor_type]
+        if values is not None:
+            self.values[size, columns] = values[:width]
+        self.values[size, 0] = timestamp
+        self.sensor_codes[size] = code
+        self.size = size + 1
+
+    def _grow(self):
+        capacity = len(self.values)
+        self.values = np.vstack([self.values, np.full_like(self.values, np.nan)])
+        self.sensor_codes = np.concatenate([self.sensor_codes, np.zeros(capacity, dtype=np.uint8)])
+
+    def snapshot(self):
+        """Return a trimmed copy of this recording that can be handed to another thread."""
+        copy = RecordingBuffer.__new__(RecordingBuffer)
+        copy.values = self.values[:self.size].copy()
+        copy.sensor_codes = self.sensor_codes[:self.size].copy()
+        copy.size = self.size
+        copy.labels = dict(self.labels)
+        return copy
+
+    def to_arrow_table(self):
+        """
+        Return the recording as a pyarrow Table with PARQUET_SCHEMA (requires pyarrow).
+
+        Columns are built straight from the value array and sensor codes, without
+        a pandas round trip. NaN cells become nulls, which Parquet stores as
+        definition levels only, and absent label columns are all-null.
+        """
+        size = self.size
+        arrays = []
+        for field in PARQUET_SCHEMA:
+            if field.name in VALUE_COLUMNS:
+                column = self.values[:size, VALUE_COLUMNS.index(field.name)]
+                arrays.append(pa.array(column, type=field.type, from_pandas=True))
+            elif field.name == "sensor":
+                arrays.append(pa.array(SENSORS_TO_COLLECT).take(pa.array(self.sensor_codes[:size])))
+            elif field.name in self.labels:
+                arrays.append(pa.array([self.labels[field.name]] * size, type=field.type))
+            else:
+                arrays.append(pa.nulls(size, type=field.type))
+        return pa.Table.from_arrays(arrays, schema=PARQUET_SCHEMA)
+
+    def to_csv_bytes(self, header=True):
+        """
+        Render the recording as CSV bytes (FIELDNAMES order, empty cells for missing values).
+
+        With header=False only the data rows are returned, for appending a segment.
+
+        Every row of a given sensor fills the same cells, and the labels are constant,
+        so each sensor gets one %-template with those parts baked in. Each row is then
+        a single format call on its value cells (repr, as csv/pandas would write them).
+        """
+        columns = [
+            name for name in FIELDNAMES
+            if name in VALUE_COLUMNS or name == "sensor" or name in self.labels
+        ]
+        rows = self.values[:self.size]
+        codes = self.sensor_codes[:self.size]
+        lines = [""] * self.size
+
+        for code, sensor_type in enumerate(SENSORS_TO_COLLECT):
+            positions = np.flatnonzero(codes == code)
+            if len(positions) == 0:
+                continue
+            start, axes = SENSOR_COLUMNS[sensor_type]
+            own_columns = set(VALUE_COLUMNS[start:start + len(axes)])
+
+            # Template with sensor values, and a bare one for packets that had none
+            cells, bare_cells, value_indices = [], [], []
+            for name in columns:
+                if name == "timestamp" or name in own_columns:
+                    cells.append("%r")
+                    value_indices.append(VALUE_COLUMNS.index(name))
+                    bare_cells.append("%r" if name == "timestamp" else "")
+                else:
+                    fixed = sensor_type if name == "sensor" else str(self.labels.get(name, ""))
+                    cells.append(fixed)
+                    bare_cells.append(fixed)
+            template = ",".join(cells) + "\n"
+            bare_template = ",".join(bare_cells) + "\n"
+
+            has_values = ~np.isnan(rows[positions, start])
+            for pos, present, row in zip(positions.tolist(), has_values.tolist(),
+                                         rows[positions].tolist()):
+                if present:
+                    lines[pos] = template % tuple([row[i] for i in value_indices])
+                else:
+                    lines[pos] = bare_template % (row[0],)
+
+        if not header:
+            return "".join(lines).encode()
+        return (",".join(columns) + "\n" + "".join(lines)).encode()
+
+
+# ==================== DATA COLLECTION CLASS ====================
 
 class DataCollector:
     """Manages the data collection session and file I/O."""
 
-    def __init__(self, session_id=None):
+    def __init__(self, session_id=None, output_format="csv", label_columns=True):
         self.config = self.load_config()
-        self.session_id = session_id if session_id else datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.session_id = session_id if session_id else time.strftime("%Y%m%d_%H%M%S")
         self.output_dir = f"training_data/session_{self.session_id}"
+        self.output_format = output_format
+        self.label_columns = label_columns  # Repeat gesture/stance/sample on every CSV row
+        self.file_labels = {}  # filename -> labels, written to session_metadata.json
+        self.parquet_writer = None
         self.sock = None
-        self.current_recording = []
+        self.selector = None
+        self.current_recording = RecordingBuffer(int(RECORDING_DURATION_SEC * EXPECTED_SAMPLE_RATE_HZ))
+
+        # Reused for every datagram so the receive loop allocates no bytes objects
+        self.receive_buffer = bytearray(4096)
+        self.receive_view = memoryview(self.receive_buffer)
         self.last_data_time = 0  # Track connection status
+        self.watch_clock_offset = None  # Watch event time minus recording time
         self.connection_active = False
 
+        # File output runs on a background thread so saving overlaps the user's
+        # reset pause instead of delaying the next prompt
+        self.write_queue = queue.Queue(maxsize=WRITE_QUEUE_SIZE)
+        self.writer_thread = threading.Thread(target=self._write_worker, daemon=True)
+        self.writer_thread.start()
+
     def load_config(self):
         """Load configuration from config.json."""
         try:
@@ -292,15 +631,33 @@ class DataCollector:
         os.makedirs(self.output_dir, exist_ok=True)
         print(f"✓ Output directory created: {self.output_dir}")
 
+        if self.output_format == "parquet":
+            # One file per run so resuming a session never overwrites earlier recordings
+            parquet_path = os.path.join(
+                self.output_dir, f"recordings_{datetime.now().strftime('%H%M%S')}.parquet"
+            )
+            self.parquet_writer = pq.ParquetWriter(parquet_path, PARQUET_SCHEMA, compression="zstd")
+            print(f"✓ Parquet output: {parquet_path}")
+
         # Set up UDP socket
         listen_ip = self.config["network"]["listen_ip"]
         listen_port = self.config["network"]["listen_port"]
 
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_BYTES)
+        # Linux reports double the usable size and caps requests at net.core.rmem_max
+        rcvbuf = self.sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+        print(f"✓ Socket receive buffer: {rcvbuf // 1024} KiB")
+        if rcvbuf < SOCKET_RCVBUF_BYTES:
+            print(f"{Colors.YELLOW}⚠️  Receive buffer capped by the OS - packets may drop during pauses{Colors.RESET}")
+            print(f"{Colors.YELLOW}   Linux: sudo sysctl -w net.core.rmem_max=12582912{Colors.RESET}")
         try:
             self.sock.bind((listen_ip, listen_port))
             self.sock.setblocking(False)
             print(f"✓ Listening on {listen_ip}:{listen_port}")
+            # Lets the recording loops sleep in the kernel until packets arrive
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.sock, selectors.EVENT_READ)
         except OSError as e:
             print(f"\nERROR: Could not bind to {listen_ip}:{listen_port}")
             print("Make sure udp_listener.py is NOT running!")
@@ -317,11 +674,7 @@ class DataCollector:
 
     def display_stance(self, stance_key):
         """Display stance definition."""
-        stance = STANCES[stance_key]
-        print("\n" + "╔" + "═" * 68 + "╗")
-        print(f"║  {Colors.BOLD}{Colors.YELLOW}Please adopt: {stance['name'].upper():<50}{Colors.RESET} ║")
-        print("╚" + "═" * 68 + "╝")
-        print(f"{Colors.BLUE}{stance['description']}{Colors.RESET}")
+        print(STANCE_BANNERS[stance_key])
         input(f"\n{Colors.BOLD}Press [Enter] when you have adopted this stance...{Colors.RESET}")
 
     def record_gesture(self, gesture_key, sample_num, total_samples=None):
@@ -340,79 +693,46 @@ class DataCollector:
         input(f"\n{Colors.BOLD}Press [Enter] when ready to execute this gesture...{Colors.RESET}")
 
         # Countdown with color
-        for i in range(COUNTDOWN_SEC, 0, -1):
-            print(f"  {Colors.YELLOW}{i}...{Colors.RESET}")
-            time.sleep(1)
+        self._countdown(COUNTDOWN_SEC)
 
         print(f"\n  {Colors.RED}{Colors.BOLD}🔴 RECORDING - EXECUTE GESTURE NOW!{Colors.RESET}")
 
         # Clear any buffered data and reset connection tracking
         self._flush_socket()
-        self.last_data_time = time.time()  # Initialize connection tracking
 
-        # Record data
-        self.current_recording = []
-        start_time = time.time()
+        # Record data (monotonic clock: immune to wall-clock adjustments)
+        self.current_recording.reset(
+            {"gesture": gesture_key, "stance": gesture["stance"], "sample": sample_num},
+            capacity=int(RECORDING_DURATION_SEC * EXPECTED_SAMPLE_RATE_HZ),
+        )
+        start_time = time.monotonic()
+        self.last_data_time = start_time  # Initialize connection tracking
+        self.watch_clock_offset = None
         recording_end = start_time + RECORDING_DURATION_SEC
         last_status_update = 0
         data_points_received = 0
 
-        while time.time() < recording_end:
-            remaining = recording_end - time.time()
+        while True:
+            now = time.monotonic()
+            if now >= recording_end:
+                break
+            remaining = recording_end - now
 
-            # Update connection status every 0.1 seconds
-            if time.time() - last_status_update > 0.1:
-                connection_status = self._get_connection_status()
-                data_rate = data_points_received / (time.time() - start_time) if (time.time() - start_time) > 0 else 0
+            # Update connection status a few times per second
+            if now - last_status_update > STATUS_UPDATE_INTERVAL_SEC:
+                connection_status = self._get_connection_status(now)
+                elapsed = now - start_time
+                data_rate = data_points_received / elapsed if elapsed > 0 else 0
 
-                status_line = (
-                    f"\r  ⏱️  {Colors.BOLD}Recording: {remaining:.1f}s{Colors.RESET} | "
-                    f"{connection_status} | "
-                    f"{Colors.BLUE}📊 {data_points_received} pts ({data_rate:.0f} pts/s){Colors.RESET}"
-                )
-                print(status_line, end="", flush=True)
-                last_status_update = time.time()
+                sys.stdout.write(SNIPPET_STATUS_TEMPLATE % (
+                    remaining, connection_status, data_points_received, data_rate
+                ))
+                sys.stdout.flush()
+                last_status_update = now
 
-            try:
-                data, addr = self.sock.recvfrom(4096)
-                parsed = json.loads(data.decode())
-                sensor_type = parsed.get("sensor")
-
-                if sensor_type in SENSORS_TO_COLLECT:
-                    # Update connection timestamp
-                    self.last_data_time = time.time()
-
-                    # Add timestamp and label
-                    record = {
-                        "timestamp": time.time() - start_time,
-                        "sensor": sensor_type,
-                        "gesture": gesture_key,
-                        "stance": gesture["stance"],
-                        "sample": sample_num,
-                    }
-
-                    # Flatten sensor values
-                    if "values" in parsed:
-                        vals = parsed["values"]
-                        if sensor_type == "rotation_vector":
-                            record["rot_x"] = vals.get("x", 0)
-                            record["rot_y"] = vals.get("y", 0)
-                            record["rot_z"] = vals.get("z", 0)
-                            record["rot_w"] = vals.get("w", 0)
-                        elif sensor_type == "linear_acceleration":
-                            record["accel_x"] = vals.get("x", 0)
-                            record["accel_y"] = vals.get("y", 0)
-                            record["accel_z"] = vals.get("z", 0)
-                        elif sensor_type == "gyroscope":
-                            record["gyro_x"] = vals.get("x", 0)
-                            record["gyro_y"] = vals.get("y", 0)
-                            record["gyro_z"] = vals.get("z", 0)
-
-                    self.current_recording.append(record)
-                    data_points_received += 1
-
-            except (BlockingIOError, json.JSONDecodeError, KeyError):
-                pass
+            # Wait (at most 20 ms, so the status line stays fresh) for packets, then drain them all
+            if self.selector.select(timeout=min(0.02, recording_end - now)):
+                data_points_received += self._drain_socket(start_time)
 
         print(f"\n  {Colors.GREEN}✓ Recording complete!{Colors.RESET}")
 
@@ -458,31 +778,39 @@ class DataCollector:
         input(f"\n{Colors.BOLD}Press [Enter] when ready to begin continuous recording...{Colors.RESET}")
 
         # Extended countdown for continuous mode
-        for i in range(COUNTDOWN_SEC, 0, -1):
-            print(f"  {Colors.YELLOW}{i}...{Colors.RESET}")
-            time.sleep(1)
+        self._countdown(COUNTDOWN_SEC)
 
         print(f"\n  {Colors.RED}{Colors.BOLD}🔴 RECORDING - BEGIN WALKING NOW!{Colors.RESET}")
 
         # Clear any buffered data and reset connection tracking
         self._flush_socket()
-        self.last_data_time = time.time()
 
-        # Record data
-        self.current_recording = []
-        start_time = time.time()
+        # Record data (monotonic clock: immune to wall-clock adjustments)
+        # No sample number for continuous mode
+        self.current_recording.reset(
+            {"gesture": gesture_key, "stance": gesture["stance"], "collection_mode": "continuous"},
+            capacity=int(duration_sec * EXPECTED_SAMPLE_RATE_HZ),
+        )
+        start_time = time.monotonic()
+        self.last_data_time = start_time
+        self.watch_clock_offset = None
         recording_end = start_time + duration_sec
         last_status_update = 0
         data_points_received = 0
-
-        while time.time() < recording_end:
-            elapsed = time.time() - start_time
-            remaining = recording_end - time.time()
+        filepath = os.path.join(self.output_dir, f"{gesture_key}_continuous.csv")
+        segments_written = 0
+        next_segment = start_time + STREAM_SEGMENT_SEC
+
+        while True:
+            now = time.monotonic()
+            if now >= recording_end:
+                break
+            elapsed = now - start_time
             progress_pct = (elapsed / duration_sec) * 100
 
             # Update connection status every 0.5 seconds (less frequent for long recording)
-            if time.time() - last_status_update > 0.5:
-                connection_status = self._get_connection_status()
+            if now - last_status_update > 0.5:
+                connection_status = self._get_connection_status(now)
                 data_rate = data_points_received / elapsed if elapsed > 0 else 0
 
                 # Show progress bar
@@ -490,87 +818,135 @@ class DataCollector:
                 filled = int(bar_width * progress_pct / 100)
                 bar = "█" * filled + "░" * (bar_width - filled)
 
-                status_line = (
-                    f"\r  ⏱️  {Colors.BOLD}{int(elapsed)}s / {int(duration_sec)}s{Colors.RESET} "
-                    f"[{bar}] {progress_pct:.0f}% | "
-                    f"{connection_status} | "
-                    f"{Colors.BLUE}📊 {data_points_received} pts ({data_rate:.0f} pts/s){Colors.RESET}"
-                )
-                print(status_line, end="", flush=True)
-                last_status_update = time.time()
-
-            try:
-                data, addr = self.sock.recvfrom(4096)
-                parsed = json.loads(data.decode())
-                sensor_type = parsed.get("sensor")
-
-                if sensor_type in SENSORS_TO_COLLECT:
-                    # Update connection timestamp
-                    self.last_data_time = time.time()
-
-                    # Add timestamp and label (no sample number for continuous mode)
-                    record = {
-                        "timestamp": time.time() - start_time,
-                        "sensor": sensor_type,
-                        "gesture": gesture_key,
-                        "stance": gesture["stance"],
-                        "collection_mode": "continuous",
-                    }
-
-                    # Flatten sensor values
-                    if "values" in parsed:
-                        vals = parsed["values"]
-                        if sensor_type == "rotation_vector":
-                            record["rot_x"] = vals.get("x", 0)
-                            record["rot_y"] = vals.get("y", 0)
-                            record["rot_z"] = vals.get("z", 0)
-                            record["rot_w"] = vals.get("w", 0)
-                        elif sensor_type == "linear_acceleration":
-                            record["accel_x"] = vals.get("x", 0)
-                            record["accel_y"] = vals.get("y", 0)
-                            record["accel_z"] = vals.get("z", 0)
-                        elif sensor_type == "gyroscope":
-                            record["gyro_x"] = vals.get("x", 0)
-                            record["gyro_y"] = vals.get("y", 0)
-                            record["gyro_z"] = vals.get("z", 0)
-
-                    self.current_recording.append(record)
-                    data_points_received += 1
-
-            except (BlockingIOError, json.JSONDecodeError, KeyError):
-                pass
+                sys.stdout.write(CONTINUOUS_STATUS_TEMPLATE % (
+                    elapsed, duration_sec, bar, progress_pct,
+                    connection_status, data_points_received, data_rate
+                ))
+                sys.stdout.flush()
+                last_status_update = now
+
+            # Hand the finished segment to the writer thread and keep recording
+            if now >= next_segment:
+                if len(self.current_recording):
+                    self._write_recording(filepath, append=segments_written > 0)
+                    self.current_recording.reset(self.current_recording.labels)
+                    segments_written += 1
+                next_segment = now + STREAM_SEGMENT_SEC
+
+            # Wait (at most 20 ms, so the status line stays fresh) for packets, then drain them all
+            if self.selector.select(timeout=min(0.02, recording_end - now)):
+                data_points_received += self._drain_socket(start_time)
 
         print(f"\n\n  {Colors.GREEN}✓ Continuous recording complete!{Colors.RESET}")
 
         # Check if we got data
-        if len(self.current_recording) == 0:
+        if data_points_received == 0:
             print(f"\n  {Colors.RED}⚠️  WARNING: No data recorded! Check your watch connection.{Colors.RESET}")
             return False
 
-        print(f"  {Colors.GREEN}📊 Captured {len(self.current_recording)} data points{Colors.RESET}")
+        print(f"  {Colors.GREEN}📊 Captured {data_points_received} data points{Colors.RESET}")
         print(f"  {Colors.GREEN}📊 Average rate: {data_points_received / duration_sec:.1f} pts/s{Colors.RESET}")
 
-        # Save to CSV (continuous mode uses different filename)
-        self._save_continuous_recording(gesture_key)
+        # Save the last segment (continuous mode uses different filename)
+        self._save_continuous_recording(gesture_key, append=segments_written > 0)
 
         return True
 
+    def _countdown(self, seconds):
+        """
+        Print a once-per-second countdown while discarding incoming packets.
+
+        Keeps the socket buffer near empty instead of letting a countdown's worth
+        of data pile up (and possibly overflow) before the recording starts.
+        """
+        deadline = time.monotonic() + seconds
+        for i in range(seconds, 0, -1):
+            print(f"  {Colors.YELLOW}{i}...{Colors.RESET}")
+            tick_end = deadline - (i - 1)
+            while True:
+                remaining = tick_end - time.monotonic()
+                if remaining <= 0:
+                    break
+                if self.selector.select(timeout=min(0.05, remaining)):
+                    self._flush_socket()
+
+    def _drain_socket(self, start_time):
+        """
+        Read every packet currently queued on the socket into the current recording.
+
+        Timestamps are seconds since start_time. Packets carrying the watch's event
+        time use it, mapped onto the recording clock by the offset seen at the first
+        packet, so jitter from Wi-Fi and Python scheduling stays out of the data.
+        The offset is re-taken if the clocks drift apart by more than
+        CONNECTION_TIMEOUT_SEC (e.g. the watch app restarted). Packets without an
+        event time are stamped with their arrival time.
+
+        Returns the number of packets stored.
+        """
+        # Bound once per drain: the loop body runs for every packet
+        recv_into = self.sock.recv_into
+        receive_buffer = self.receive_buffer
+        receive_view = self.receive_view
+        monotonic = time.monotonic
+        append = self.current_recording.append
+
+        # Everything queued now arrived by this time
+        received = monotonic()
+        elapsed = received - start_time
+        offset = self.watch_clock_offset
+
+        records_added = 0
+        while True:
+            try:
+                nbytes = recv_into(receive_buffer)
+            except BlockingIOError:
+                break
+
+            try:
+                packet = parse_packet(receive_view[:nbytes])
+            except (ValueError, KeyError):
+                continue  # Malformed packet
+            if packet is None:
+                continue
+
+            sensor_type, event_time, values = packet
+            if event_time is None:
+                timestamp = monotonic() - start_time
+            else:
+                if offset is None or abs(event_time - offset - elapsed) > CONNECTION_TIMEOUT_SEC:
+                    offset = event_time - elapsed
+                timestamp = event_time - offset
+
+            append(timestamp, sensor_type, values)
+            records_added += 1
+
+        self.watch_clock_offset = offset
+        if records_added:
+            # Update connection timestamp
+            self.last_data_time = received
+        return records_added
+
     def _flush_socket(self):
         """Clear any buffered data from the socket."""
+        # With MSG_TRUNC (Linux) each datagram is discarded after copying at most one
+        # byte into the receive buffer; elsewhere fall back to full-size reads.
+        # MSG_DONTWAIT keeps the drain non-blocking whatever the socket's mode.
+        flags = getattr(socket, "MSG_TRUNC", 0) | getattr(socket, "MSG_DONTWAIT", 0)
+        nbytes = 1 if hasattr(socket, "MSG_TRUNC") else len(self.receive_buffer)
+        recv_into = self.sock.recv_into
+        receive_buffer = self.receive_buffer
         try:
             while True:
-                self.sock.recvfrom(4096)
+                recv_into(receive_buffer, nbytes, flags)
         except BlockingIOError:
             pass
 
-    def _get_connection_status(self):
+    def _get_connection_status(self, now=None):
         """Get current connection status with color coding."""
-        if time.time() - self.last_data_time > CONNECTION_TIMEOUT_SEC:
-            self.connection_active = False
-            return f"{Colors.RED}❌ CONNECTION LOST{Colors.RESET}"
-        else:
-            self.connection_active = True
-            return f"{Colors.GREEN}✓ CONNECTED{Colors.RESET}"
+        if now is None:
+            now = time.monotonic()
+        self.connection_active = now - self.last_data_time <= CONNECTION_TIMEOUT_SEC
+        return CONNECTED_STATUS if self.connection_active else CONNECTION_LOST_STATUS
 
     def _save_recording(self, gesture_key, sample_num):
         """Save the current recording to a CSV file (snippet mode)."""
@@ -580,42 +956,84 @@ class DataCollector:
         if len(self.current_recording) == 0:
             return
 
-        # Determine all possible fields
-        fieldnames = set()
-        for record in self.current_recording:
-            fieldnames.update(record.keys())
+        saved_to = self._write_recording(filepath)
 
-        fieldnames = sorted(list(fieldnames))
+        print(f"  {Colors.GREEN}💾 Saved: {saved_to}{Colors.RESET}")
 
-        with open(filepath, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(self.current_recording)
-
-        print(f"  {Colors.GREEN}💾 Saved: {filename}{Colors.RESET}")
+    def _save_continuous_recording(self, gesture_key, append=False):
+        """
+        Save the current continuous recording to a single CSV file.
 
-    def _save_continuous_recording(self, gesture_key):
-        """Save the current continuous recording to a single CSV file."""
+        With append=True the rows complete a file whose earlier segments were
+        already written during the recording.
+        """
         filename = f"{gesture_key}_continuous.csv"
         filepath = os.path.join(self.output_dir, filename)
 
-        if len(self.current_recording) == 0:
+        if len(self.current_recording) == 0 and not append:
             return
 
-        # Determine all possible fields
-        fieldnames = set()
-        for record in self.current_recording:
-            fieldnames.update(record.keys())
+        saved_to = self._write_recording(filepath, append=append)
 
-        fieldnames = sorted(list(fieldnames))
+        print(f"  {Colors.GREEN}💾 Saved: {saved_to}{Colors.RESET}")
+        print(f"  {Colors.BLUE}ℹ️  This continuous recording will be processed with a sliding window in the ML pipeline{Colors.RESET}")
 
-        with open(filepath, 'w', newline='') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(self.current_recording)
+    def _write_recording(self, filepath, append=False):
+        """
+        Queue a copy of the current recording for the background writer.
 
-        print(f"  {Colors.GREEN}💾 Saved: {filename}{Colors.RESET}")
-        print(f"  {Colors.BLUE}ℹ️  This continuous recording will be processed with a sliding window in the ML pipeline{Colors.RESET}")
+        append=True adds the rows (without a header) to an existing CSV file.
+
+        The recording's labels are stored per file for session_metadata.json and,
+        unless label columns are disabled, repeated on every CSV row.
+
+        CSV: one file per recording at filepath, columns sorted by name.
+        Parquet: appended as a row group to the session file (filepath is unused).
+
+        Returns the name of the file being written, for display.
+        """
+        recording = self.current_recording.snapshot()
+        self.file_labels[os.path.basename(filepath)] = dict(recording.labels)
+        if not self.label_columns and self.parquet_writer is None:
+            recording.labels = {}
+        self.write_queue.put((filepath, self._write_recording_file, (recording, append)))
+        if self.parquet_writer is not None:
+            return os.path.basename(self.parquet_writer.where)
+        return os.path.basename(filepath)
+
+    def _write_worker(self):
+        """
+        Background thread: run queued (filepath, write function, args) jobs in order
+        until a None sentinel arrives.
+        """
+        while True:
+            job = self.write_queue.get()
+            if job is None:
+                return
+            filepath, write, args = job
+            try:
+                write(filepath, *args)
+            except Exception as e:
+                print(f"\n  {Colors.RED}❌ ERROR saving {filepath}: {e}{Colors.RESET}")
+
+    def _write_recording_file(self, filepath, recording, append=False):
+        """Write one recording in the session's output format (runs on the writer thread)."""
+        if self.parquet_writer is not None:
+            self.parquet_writer.write_table(recording.to_arrow_table())
+            return
+
+        # Pre-rendered bytes go straight to the file descriptor (no text-mode file object)
+        payload = memoryview(recording.to_csv_bytes(header=not append))
+        mode = os.O_APPEND if append else os.O_TRUNC
+        fd = os.open(filepath, os.O_WRONLY | os.O_CREAT | mode | getattr(os, "O_BINARY", 0), 0o644)
+        try:
+            while payload:
+                payload = payload[os.write(fd, payload):]
+            # Once per file, off the receive thread: a crash or power loss later in
+            # the session cannot take already-announced recordings with it
+            os.fsync(fd)
+        finally:
+            os.close(fd)
 
     def save_session_metadata(self, gestures_completed):
         """Save metadata about this collection session."""
@@ -626,19 +1044,36 @@ class DataCollector:
             "samples_per_gesture": SAMPLES_PER_GESTURE,
             "sensors_collected": SENSORS_TO_COLLECT,
             "gestures_completed": gestures_completed,
+            "label_columns_in_csv": self.label_columns,
+            "per_file_labels": dict(self.file_labels),
             "config": self.config
         }
 
         filepath = os.path.join(self.output_dir, "session_metadata.json")
-        with open(filepath, 'w') as f:
-            json.dump(metadata, f, indent=2)
+        # Queued behind the recordings, so the metadata is only written once every
+        # file it lists is on disk
+        self.write_queue.put((filepath, self._write_metadata_file, (metadata,)))
 
         print(f"\n💾 Session metadata saved: {filepath}")
 
+    def _write_metadata_file(self, filepath, metadata):
+        """Write session_metadata.json (runs on the writer thread)."""
+        with open(filepath, 'wb') as f:
+            f.write(json_dumps_indented(metadata))
+
     def cleanup(self):
         """Clean up resources."""
+        if self.selector is not None:
+            self.selector.close()
         if self.sock:
             self.sock.close()
+        # Let the writer finish everything already queued before closing files
+        if self.writer_thread.is_alive():
+            self.write_queue.put(None)
+            self.writer_thread.join()
+        if self.parquet_writer is not None:
+            self.parquet_writer.close()
+            self.parquet_writer = None
 
 
 # ==================== ARGUMENT PARSING ====================
@@ -694,6 +1129,22 @@ Available gestures: punch, jump, turn, walk, noise
         help=f'Recording duration for continuous mode in minutes (default: {CONTINUOUS_RECORDING_DURATION_MIN})'
     )
 
+    parser.add_argument(
+        '--format',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Output format: one CSV per recording (default), or a single Parquet '
+             'file per session with each recording appended as a row group (requires pyarrow)'
+    )
+
+    parser.add_argument(
+        '--no-label-columns',
+        dest='label_columns',
+        action='store_false',
+        help='Omit the constant gesture/stance/sample columns from each CSV row '
+             '(labels are still recorded per file in session_metadata.json)'
+    )
+
     parser.add_argument(
         '--session-id',
         type=str,
@@ -711,9 +1162,9 @@ Available gestures: punch, jump, turn, walk, noise
 
 def list_gestures_info():
     """Display information about all available gestures."""
-    print("\n" + "╔" + "═" * 68 + "╗")
+    print("\n" + BOX_TOP)
     print("║" + f"  {Colors.BOLD}{Colors.GREEN}AVAILABLE GESTURES{Colors.RESET}".ljust(78) + "║")
-    print("╚" + "═" * 68 + "╝")
+    print(BOX_BOTTOM)
 
     for gesture_key, gesture in GESTURES.items():
         mode = gesture.get("collection_mode", "snippet")
@@ -753,6 +1204,11 @@ def main():
         list_gestures_info()
         return
 
+    if args.format == "parquet" and not PYARROW_AVAILABLE:
+        print(f"\n{Colors.RED}ERROR: --format parquet requires pyarrow{Colors.RESET}")
+        print(f"{Colors.YELLOW}Install with: pip install pyarrow{Colors.RESET}\n")
+        return
+
     # Parse gestures to collect
     gestures_to_collect = None
     if args.gestures:
@@ -785,7 +1241,7 @@ def main():
         print(f"{Colors.YELLOW}⚙️  Using custom continuous duration: {CONTINUOUS_RECORDING_DURATION_MIN}min{Colors.RESET}")
 
     print("\n")
-    print("╔" + "═" * 68 + "╗")
+    print(BOX_TOP)
     print("║" + " " * 68 + "║")
     title = f"{Colors.BOLD}{Colors.GREEN}SILKSONG CONTROLLER - PHASE II DATA COLLECTION{Colors.RESET}"
     subtitle = f"{Colors.BLUE}IMU Gesture Training Data Acquisition{Colors.RESET}"
@@ -793,7 +1249,7 @@ def main():
     print(f"║  {title}  ║")
     print(f"║  {subtitle}  ║")
     print("║" + " " * 68 + "║")
-    print("╚" + "═" * 68 + "╝")
+    print(BOX_BOTTOM)
 
     # Calculate SIMPLIFIED dataset statistics
     target_gestures = ["punch", "jump", "turn", "walk"]
@@ -873,7 +1329,11 @@ The NOISE class is a {Colors.YELLOW}single, diverse category{Colors.RESET} conta
     input(f"\n{Colors.BOLD}{Colors.GREEN}Press [Enter] to begin setup...{Colors.RESET}")
 
     # Initialize collector with optional custom session ID
-    collector = DataCollector(session_id=args.session_id)
+    collector = DataCollector(
+        session_id=args.session_id,
+        output_format=args.format,
+        label_columns=args.label_columns,
+    )
 
     if args.session_id:
         print(f"{Colors.YELLOW}📁 Resuming/Using session: {args.session_id}{Colors.RESET}")
@@ -894,28 +1354,32 @@ The NOISE class is a {Colors.YELLOW}single, diverse category{Colors.RESET} conta
 
         # Wait for first packet with visual feedback
         timeout = 15
-        start_wait = time.time()
+        deadline = time.monotonic() + timeout
         received_data = False
         last_update = 0
 
-        while time.time() - start_wait < timeout:
-            elapsed = time.time() - start_wait
-            remaining = timeout - elapsed
+        while True:
+            now = time.monotonic()
+            remaining = deadline - now
+            if remaining <= 0:
+                break
 
             # Update status every 0.5 seconds
-            if time.time() - last_update > 0.5:
+            if now - last_update > 0.5:
                 print(f"\r{Colors.YELLOW}⏳ Waiting for data... {remaining:.1f}s remaining{Colors.RESET}", end="", flush=True)
-                last_update = time.time()
+                last_update = now
 
+            # Sleep in the kernel until a packet arrives or the next status update is due
+            if not collector.selector.select(timeout=min(0.5, remaining)):
+                continue
             try:
-                data, _ = collector.sock.recvfrom(4096)
-                parsed = json.loads(data.decode())
-                if parsed.get("sensor") in SENSORS_TO_COLLECT:
+                nbytes = collector.sock.recv_into(collector.receive_buffer)
+                if parse_packet(collector.receive_view[:nbytes]) is not None:
                     received_data = True
-                    collector.last_data_time = time.time()  # Initialize connection tracking
+                    collector.last_data_time = time.monotonic()  # Initialize connection tracking
                     break
-            except (BlockingIOError, json.JSONDecodeError, KeyError):
-                time.sleep(0.1)
+            except (BlockingIOError, ValueError, KeyError):
+                continue  # Spurious wake-up or malformed packet
 
         print()  # New line after status updates
 
@@ -1021,11 +1485,11 @@ The NOISE class is a {Colors.YELLOW}single, diverse category{Colors.RESET} conta
         collector.save_session_metadata(gestures_completed)
 
         # Final summary
-        print("\n" + "╔" + "═" * 68 + "╗")
+        print("\n" + BOX_TOP)
         print("║" + " " * 68 + "║")
         print("║" + f"  {Colors.BOLD}{Colors.GREEN}DATA COLLECTION COMPLETE!{Colors.RESET}".center(78) + "║")
         print("║" + " " * 68 + "║")
-        print("╚" + "═" * 68 + "╝")
+        print(BOX_BOTTOM)
 
         print(f"\n{Colors.BOLD}📊 Session Summary:{Colors.RESET}")
         print(f"   {Colors.BLUE}• Session ID: {collector.session_id}{Colors.RESET}")
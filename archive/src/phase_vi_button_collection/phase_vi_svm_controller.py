@@ -31,7 +31,7 @@ from pynput.keyboard import Controller
 import joblib
 import numpy as np
 from scipy import stats
-from scipy.fft import fft
+from scipy.fft import rfft
 import sys
 import os
 from pathlib import Path
@@ -45,6 +45,7 @@ UDP_PORT = 12345
 WINDOW_SIZE_SEC = 0.3  # 300ms windows for prediction
 SAMPLE_RATE = 50  # Hz
 WINDOW_SIZE_SAMPLES = int(WINDOW_SIZE_SEC * SAMPLE_RATE)
+FEATURE_AXES = ['accel_x', 'accel_y', 'accel_z', 'gyro_x', 'gyro_y', 'gyro_z']
 CONFIDENCE_THRESHOLD = 5  # Require 5 consecutive matching predictions
 
 # Model paths (relative to project root)
@@ -140,40 +141,40 @@ def extract_features(window_data):
     """
     features = {}
 
-    # Convert to numpy arrays
-    accel_x = np.array([d['accel_x'] for d in window_data])
-    accel_y = np.array([d['accel_y'] for d in window_data])
-    accel_z = np.array([d['accel_z'] for d in window_data])
-    gyro_x = np.array([d['gyro_x'] for d in window_data])
-    gyro_y = np.array([d['gyro_y'] for d in window_data])
-    gyro_z = np.array([d['gyro_z'] for d in window_data])
-
-    sensors = {
-        'accel_x': accel_x, 'accel_y': accel_y, 'accel_z': accel_z,
-        'gyro_x': gyro_x, 'gyro_y': gyro_y, 'gyro_z': gyro_z
-    }
+    # One (samples, 6) array instead of six per-axis lists
+    data = np.array(
+        [[d[name] for name in FEATURE_AXES] for d in window_data], dtype=float
+    )
 
-    for name, data in sensors.items():
-        # Time-domain features
-        features[f'{name}_mean'] = np.mean(data)
-        features[f'{name}_std'] = np.std(data)
-        features[f'{name}_min'] = np.min(data)
-        features[f'{name}_max'] = np.max(data)
-        features[f'{name}_range'] = np.ptp(data)
-        features[f'{name}_median'] = np.median(data)
-        features[f'{name}_skew'] = stats.skew(data)
-        features[f'{name}_kurtosis'] = stats.kurtosis(data)
+    # Each statistic is computed for all six axes at once (axis=0)
+    # Real input: rfft returns only the non-negative half of the spectrum,
+    # which holds the FFT maximum (|X[k]| == |X[n-k]|) and every candidate bin
+    # for the dominant frequency
+    fft_vals = np.abs(rfft(data, axis=0))
+    freqs = np.fft.rfftfreq(len(data), 1/SAMPLE_RATE)
+    dominant_freq_idx = np.argmax(fft_vals[1:len(data)//2], axis=0) + 1
 
+    axis_features = {
+        # Time-domain features
+        'mean': np.mean(data, axis=0),
+        'std': np.std(data, axis=0),
+        'min': np.min(data, axis=0),
+        'max': np.max(data, axis=0),
+        'range': np.ptp(data, axis=0),
+        'median': np.median(data, axis=0),
+        'skew': stats.skew(data, axis=0),
+        'kurtosis': stats.kurtosis(data, axis=0),
         # Frequency-domain features (FFT)
-        fft_vals = np.abs(fft(data))
-        features[f'{name}_fft_max'] = np.max(fft_vals)
+        'fft_max': np.max(fft_vals, axis=0),
+        'dominant_freq': np.abs(freqs[dominant_freq_idx]),
+    }
 
-        # Dominant frequency
-        freqs = np.fft.fftfreq(len(data), 1/SAMPLE_RATE)
-        dominant_freq_idx = np.argmax(fft_vals[1:len(fft_vals)//2]) + 1
-        features[f'{name}_dominant_freq'] = abs(freqs[dominant_freq_idx])
+    for i, name in enumerate(FEATURE_AXES):
+        for stat, values in axis_features.items():
+            features[f'{name}_{stat}'] = values[i]
 
     # Magnitude features
+    accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z = data.T
     accel_mag = np.sqrt(accel_x**2 + accel_y**2 + accel_z**2)
     gyro_mag = np.sqrt(gyro_x**2 + gyro_y**2 + gyro_z**2)
 
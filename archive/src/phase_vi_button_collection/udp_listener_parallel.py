@@ -11,12 +11,11 @@ import os
 # Add shared_utils to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'shared_utils'))
 import network_utils
+from feature_extractor import extract_window_features, prepare_feature_vector  # Same features as training
+from sensor_packets import parse_binary_reading  # Binary wire format; "{" datagrams are JSON
 from zeroconf import ServiceInfo, Zeroconf
 import joblib
 import pandas as pd
-import numpy as np
-from scipy import stats
-from scipy.fft import fft
 
 # --- Global State ---
 keyboard = Controller()
@@ -119,93 +118,6 @@ def load_parallel_models():
     return models
 
 
-def extract_window_features(window_df):
-    """Extract comprehensive features from a time window of sensor data."""
-    features = {}
-
-    # Separate by sensor type
-    accel = window_df[window_df["sensor"] == "linear_acceleration"]
-    gyro = window_df[window_df["sensor"] == "gyroscope"]
-    rot = window_df[window_df["sensor"] == "rotation_vector"]
-
-    # ========== ACCELERATION FEATURES ==========
-    if len(accel) > 0:
-        for axis in ["accel_x", "accel_y", "accel_z"]:
-            values = accel[axis].dropna()
-
-            if len(values) > 0:
-                features[f"{axis}_mean"] = values.mean()
-                features[f"{axis}_std"] = values.std()
-                features[f"{axis}_max"] = values.max()
-                features[f"{axis}_min"] = values.min()
-                features[f"{axis}_range"] = values.max() - values.min()
-                features[f"{axis}_median"] = values.median()
-                features[f"{axis}_skew"] = stats.skew(values)
-                features[f"{axis}_kurtosis"] = stats.kurtosis(values)
-
-                threshold = values.mean() + 2 * values.std()
-                features[f"{axis}_peak_count"] = len(values[values > threshold])
-
-                if len(values) > 2:
-                    fft_vals = np.abs(fft(values))[: len(values) // 2]
-                    if len(fft_vals) > 0:
-                        features[f"{axis}_fft_max"] = fft_vals.max()
-                        features[f"{axis}_dominant_freq"] = fft_vals.argmax()
-                        features[f"{axis}_fft_mean"] = fft_vals.mean()
-
-    # ========== GYROSCOPE FEATURES ==========
-    if len(gyro) > 0:
-        for axis in ["gyro_x", "gyro_y", "gyro_z"]:
-            values = gyro[axis].dropna()
-
-            if len(values) > 0:
-                features[f"{axis}_mean"] = values.mean()
-                features[f"{axis}_std"] = values.std()
-                features[f"{axis}_max_abs"] = values.abs().max()
-                features[f"{axis}_range"] = values.max() - values.min()
-                features[f"{axis}_skew"] = stats.skew(values)
-                features[f"{axis}_kurtosis"] = stats.kurtosis(values)
-                features[f"{axis}_rms"] = np.sqrt(np.mean(values**2))
-
-                if len(values) > 2:
-                    fft_vals = np.abs(fft(values))[: len(values) // 2]
-                    if len(fft_vals) > 0:
-                        features[f"{axis}_fft_max"] = fft_vals.max()
-
-    # ========== ROTATION FEATURES ==========
-    if len(rot) > 0:
-        for axis in ["rot_x", "rot_y", "rot_z", "rot_w"]:
-            values = rot[axis].dropna()
-
-            if len(values) > 0:
-                features[f"{axis}_mean"] = values.mean()
-                features[f"{axis}_std"] = values.std()
-                features[f"{axis}_range"] = values.max() - values.min()
-
-    # ========== CROSS-SENSOR FEATURES ==========
-    if len(accel) > 0:
-        accel_mag = np.sqrt(
-            accel["accel_x"].fillna(0) ** 2
-            + accel["accel_y"].fillna(0) ** 2
-            + accel["accel_z"].fillna(0) ** 2
-        )
-        features["accel_magnitude_mean"] = accel_mag.mean()
-        features["accel_magnitude_max"] = accel_mag.max()
-        features["accel_magnitude_std"] = accel_mag.std()
-
-    if len(gyro) > 0:
-        gyro_mag = np.sqrt(
-            gyro["gyro_x"].fillna(0) ** 2
-            + gyro["gyro_y"].fillna(0) ** 2
-            + gyro["gyro_z"].fillna(0) ** 2
-        )
-        features["gyro_magnitude_mean"] = gyro_mag.mean()
-        features["gyro_magnitude_max"] = gyro_mag.max()
-        features["gyro_magnitude_std"] = gyro_mag.std()
-
-    return features
-
-
 # Load parallel models
 parallel_models = load_parallel_models()
 ML_ENABLED = parallel_models is not None
@@ -227,6 +139,9 @@ sensor_queue = Queue(maxsize=1000)
 locomotion_queue = Queue(maxsize=100)  # Binary predictions
 action_queue = Queue(maxsize=100)      # Multiclass predictions
 
+# Kernel receive buffer requested for the UDP socket (absorbs sensor bursts)
+SOCKET_RCVBUF_BYTES = 1 << 20
+
 # Gesture name mappings
 BINARY_GESTURES = ['walk', 'idle']
 MULTI_GESTURES = ['jump', 'punch', 'turn_left', 'turn_right']
@@ -239,12 +154,22 @@ MULTI_GESTURES = ['jump', 'punch', 'turn_left', 'turn_right']
 def collector_thread(sock, sensor_queue, stop_event):
     """Thread 1: Collect sensor data from UDP and push to queue."""
     print("[COLLECTOR] Thread started")
+    # Blocking receive with timeout, so stop_event is checked at least every 0.1s
+    sock.settimeout(0.1)
 
     while not stop_event.is_set():
         try:
-            sock.settimeout(0.1)
             data, addr = sock.recvfrom(2048)
 
+            if data[:1] != b"{":
+                sensor_reading = parse_binary_reading(data)
+                if sensor_reading is not None:
+                    try:
+                        sensor_queue.put(sensor_reading, timeout=0.01)
+                    except:
+                        pass  # Queue full, drop packet
+                continue
+
             try:
                 parsed_json = json.loads(data.decode())
                 current_time = time.time()
@@ -328,10 +253,7 @@ def locomotion_predictor_thread(models, sensor_queue, locomotion_queue, stop_eve
                     features = extract_window_features(buffer_df)
 
                     # Create feature vector
-                    feature_vector = pd.DataFrame([features])
-                    feature_vector = feature_vector.reindex(
-                        columns=models['binary_feature_names'], fill_value=0
-                    )
+                    feature_vector = prepare_feature_vector(features, models['binary_feature_names'])
 
                     # Scale and predict
                     features_scaled = models['binary_scaler'].transform(feature_vector)
@@ -394,10 +316,7 @@ def action_predictor_thread(models, sensor_queue, action_queue, stop_event):
                     features = extract_window_features(buffer_df)
 
                     # Create feature vector
-                    feature_vector = pd.DataFrame([features])
-                    feature_vector = feature_vector.reindex(
-                        columns=models['multi_feature_names'], fill_value=0
-                    )
+                    feature_vector = prepare_feature_vector(features, models['multi_feature_names'])
 
                     # Scale and predict
                     features_scaled = models['multi_scaler'].transform(feature_vector)
@@ -556,6 +475,9 @@ def actor_thread(locomotion_queue, action_queue, stop_event):
 
 # --- Main Listener Logic ---
 sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+# Larger kernel buffer so packet bursts survive while the collector thread waits
+# for the GIL behind the predictor threads
+sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, SOCKET_RCVBUF_BYTES)
 sock.bind((LISTEN_IP, LISTEN_PORT))
 
 # --- Network Service Discovery Setup ---
@@ -3,7 +3,8 @@ Feature Extractor for IMU Gesture Recognition
 
 This module provides feature extraction functions used by both:
 1. Training pipeline (CS156_Silksong_Watch.ipynb)
-2. Real-time controller (udp_listener.py - Phase IV)
+2. Real-time controllers (udp_listener.py - Phase IV,
+   udp_listener_parallel.py - Phase VI)
 
 The extract_window_features() function computes ~60+ features from
 a time window of sensor data for gesture classification.
@@ -11,8 +12,98 @@ a time window of sensor data for gesture classification.
 
 import numpy as np
 import pandas as pd
-from scipy import stats
-from scipy.fft import fft
+from scipy.fft import rfft
+
+ACCEL_AXES = ['accel_x', 'accel_y', 'accel_z']
+GYRO_AXES = ['gyro_x', 'gyro_y', 'gyro_z']
+ROT_AXES = ['rot_x', 'rot_y', 'rot_z', 'rot_w']
+
+# Per-axis statistics, in the order their features are added
+ACCEL_STATS = ('mean', 'std', 'max', 'min', 'range', 'median', 'skew', 'kurtosis',
+               'peak_count', 'fft_max', 'dominant_freq', 'fft_mean')
+GYRO_STATS = ('mean', 'std', 'max_abs', 'range', 'skew', 'kurtosis', 'rms', 'fft_max')
+ROT_STATS = ('mean', 'std', 'range')
+
+# Feature names per axis ('accel_x_mean', ...), formatted once at import
+# rather than with f-strings on every window
+ACCEL_FEATURE_NAMES = [[f'{axis}_{stat}' for stat in ACCEL_STATS] for axis in ACCEL_AXES]
+GYRO_FEATURE_NAMES = [[f'{axis}_{stat}' for stat in GYRO_STATS] for axis in GYRO_AXES]
+ROT_FEATURE_NAMES = [[f'{axis}_{stat}' for stat in ROT_STATS] for axis in ROT_AXES]
+
+# Trained feature order (as a tuple) -> ({feature name: column index}, column Index)
+_FEATURE_INDEX_CACHE = {}
+
+
+def _sensor_rows(window_df, mask, columns):
+    """
+    Rows selected by mask as a float ndarray with one column per axis, NaN
+    where an axis is missing.
+    """
+    if not mask.any():
+        # Windows built from per-sensor readings lack the other sensors' columns
+        return np.empty((0, len(columns)))
+    return window_df.loc[mask].reindex(columns=columns).to_numpy(dtype=float)
+
+
+def _complete_rows(values):
+    """
+    Rows of values with every axis present, for the per-axis statistics.
+
+    Dropping whole rows lets all axes be processed as one matrix. Collectors
+    always write every axis of a reading (or skip the packet), so this matches
+    the former per-axis dropna.
+    """
+    return values[~np.isnan(values).any(axis=1)]
+
+
+def _magnitude(values):
+    """Euclidean norm of each row, counting missing axes as 0 (fillna(0))."""
+    return np.linalg.norm(np.where(np.isnan(values), 0.0, values), axis=1)
+
+
+def _fft_magnitudes(values):
+    """
+    |FFT| of every column, first n//2 bins (n = rows), from one real-input FFT.
+
+    rfft returns the non-redundant half of the spectrum, whose first n//2 bins
+    equal those of the full complex FFT previously computed per axis.
+    """
+    return np.abs(rfft(values, axis=0))[:len(values) // 2]
+
+
+def _std(values):
+    """
+    Sample standard deviation (ddof=1) down axis 0, NaN below two values, like
+    Series.std. Returns a scalar for 1-D input and one value per column for 2-D.
+    """
+    if len(values) > 1:
+        return values.std(axis=0, ddof=1)
+    return np.full(values.shape[1:], np.nan)[()]
+
+
+def _moments(values):
+    """
+    Mean, sample std (ddof=1), biased skewness and excess kurtosis of every
+    column, all from one set of deviations from the mean.
+
+    Equivalent to values.mean(axis=0), _std(values), stats.skew(values, axis=0)
+    and stats.kurtosis(values, axis=0) (including NaN for constant columns); the
+    scipy calls carry ~0.7 ms of per-call overhead each on a 150-sample window.
+    """
+    n = len(values)
+    mean = values.mean(axis=0)
+    dev = values - mean
+    dev2 = dev * dev
+    sum_sq = dev2.sum(axis=0)
+    m2 = sum_sq / n
+    m3 = (dev2 * dev).mean(axis=0)
+    m4 = (dev2 * dev2).mean(axis=0)
+    with np.errstate(all='ignore'):
+        std = np.sqrt(sum_sq / (n - 1)) if n > 1 else np.full(values.shape[1], np.nan)
+        constant = m2 <= (np.finfo(m2.dtype).eps * mean)**2
+        skew = np.where(constant, np.nan, m3 / m2**1.5)
+        kurtosis = np.where(constant, np.nan, m4 / m2**2 - 3.0)
+    return mean, std, skew, kurtosis
 
 
 def extract_window_features(window_df):
@@ -40,7 +131,8 @@ def extract_window_features(window_df):
         
     Notes:
     ------
-    - Missing data is handled by filling with 0
+    - Readings with a missing axis are skipped for the per-axis statistics;
+      magnitude features count a missing axis as 0
     - Feature names match those used in training
     - Designed for 3-second windows at ~50Hz (150 samples)
     
@@ -52,102 +144,92 @@ def extract_window_features(window_df):
     """
     features = {}
     
-    # Separate by sensor type
-    accel = window_df[window_df['sensor'] == 'linear_acceleration']
-    gyro = window_df[window_df['sensor'] == 'gyroscope']
-    rot = window_df[window_df['sensor'] == 'rotation_vector']
+    # Separate by sensor type, as plain float arrays (one column per axis)
+    sensor = window_df['sensor'].to_numpy()
+    accel_rows = _sensor_rows(window_df, sensor == 'linear_acceleration', ACCEL_AXES)
+    gyro_rows = _sensor_rows(window_df, sensor == 'gyroscope', GYRO_AXES)
+    accel = _complete_rows(accel_rows)
+    gyro = _complete_rows(gyro_rows)
+    rot = _complete_rows(_sensor_rows(window_df, sensor == 'rotation_vector', ROT_AXES))
     
     # ========== ACCELERATION FEATURES ==========
+    # Every statistic is reduced column-wise (axis=0) over the whole matrix,
+    # listed in ACCEL_STATS order, then stored per axis name.
     if len(accel) > 0:
-        for axis in ['accel_x', 'accel_y', 'accel_z']:
-            values = accel[axis].dropna()
-            
-            if len(values) > 0:
-                # Time-domain statistics
-                features[f'{axis}_mean'] = values.mean()
-                features[f'{axis}_std'] = values.std()
-                features[f'{axis}_max'] = values.max()
-                features[f'{axis}_min'] = values.min()
-                features[f'{axis}_range'] = values.max() - values.min()
-                features[f'{axis}_median'] = values.median()
-                
-                # Distribution shape
-                features[f'{axis}_skew'] = stats.skew(values)
-                features[f'{axis}_kurtosis'] = stats.kurtosis(values)
-                
-                # Peak detection
-                threshold = values.mean() + 2 * values.std()
-                features[f'{axis}_peak_count'] = len(values[values > threshold])
-                
-                # Frequency domain (FFT)
-                if len(values) > 2:
-                    fft_vals = np.abs(fft(values))[:len(values)//2]
-                    if len(fft_vals) > 0:
-                        features[f'{axis}_fft_max'] = fft_vals.max()
-                        features[f'{axis}_dominant_freq'] = fft_vals.argmax()
-                        features[f'{axis}_fft_mean'] = fft_vals.mean()
+        # Time-domain statistics and distribution shape
+        mean, std, skew, kurtosis = _moments(accel)
+        vmax, vmin = accel.max(axis=0), accel.min(axis=0)
+        median = np.median(accel, axis=0)
+        
+        # Peak detection (values above mean + 2 std)
+        peak_count = np.count_nonzero(accel > mean + 2 * std, axis=0)
+        
+        accel_stats = [mean, std, vmax, vmin, vmax - vmin, median, skew, kurtosis,
+                       peak_count.tolist()]
+        
+        # Frequency domain (FFT)
+        if len(accel) > 2:
+            accel_fft = _fft_magnitudes(accel)
+            accel_stats += [accel_fft.max(axis=0), accel_fft.argmax(axis=0),
+                            accel_fft.mean(axis=0)]
+
+        # zip stops at the shorter list, so FFT names are skipped without FFT stats
+        for names, values in zip(ACCEL_FEATURE_NAMES, zip(*accel_stats)):
+            features.update(zip(names, values))
     
     # ========== GYROSCOPE FEATURES ==========
     if len(gyro) > 0:
-        for axis in ['gyro_x', 'gyro_y', 'gyro_z']:
-            values = gyro[axis].dropna()
-            
-            if len(values) > 0:
-                # Time-domain statistics
-                features[f'{axis}_mean'] = values.mean()
-                features[f'{axis}_std'] = values.std()
-                features[f'{axis}_max_abs'] = values.abs().max()
-                features[f'{axis}_range'] = values.max() - values.min()
-                
-                # Distribution shape
-                features[f'{axis}_skew'] = stats.skew(values)
-                features[f'{axis}_kurtosis'] = stats.kurtosis(values)
-                
-                # RMS (root mean square)
-                features[f'{axis}_rms'] = np.sqrt(np.mean(values**2))
-                
-                # Frequency domain
-                if len(values) > 2:
-                    fft_vals = np.abs(fft(values))[:len(values)//2]
-                    if len(fft_vals) > 0:
-                        features[f'{axis}_fft_max'] = fft_vals.max()
+        # Time-domain statistics, distribution shape and RMS (root mean square)
+        mean, std, skew, kurtosis = _moments(gyro)
+        max_abs = np.abs(gyro).max(axis=0)
+        value_range = gyro.max(axis=0) - gyro.min(axis=0)
+        rms = np.sqrt(np.mean(gyro**2, axis=0))
+        
+        gyro_stats = [mean, std, max_abs, value_range, skew, kurtosis, rms]
+        
+        # Frequency domain
+        if len(gyro) > 2:
+            gyro_stats.append(_fft_magnitudes(gyro).max(axis=0))
+
+        for names, values in zip(GYRO_FEATURE_NAMES, zip(*gyro_stats)):
+            features.update(zip(names, values))
     
     # ========== ROTATION FEATURES ==========
     if len(rot) > 0:
-        for axis in ['rot_x', 'rot_y', 'rot_z', 'rot_w']:
-            values = rot[axis].dropna()
-            
-            if len(values) > 0:
-                features[f'{axis}_mean'] = values.mean()
-                features[f'{axis}_std'] = values.std()
-                features[f'{axis}_range'] = values.max() - values.min()
+        rot_stats = [rot.mean(axis=0), _std(rot), rot.max(axis=0) - rot.min(axis=0)]
+
+        for names, values in zip(ROT_FEATURE_NAMES, zip(*rot_stats)):
+            features.update(zip(names, values))
     
     # ========== CROSS-SENSOR FEATURES ==========
+    # Magnitudes use every reading of the sensor, with missing axes as 0
     # Acceleration magnitude
-    if len(accel) > 0:
-        accel_mag = np.sqrt(
-            accel['accel_x'].fillna(0)**2 + 
-            accel['accel_y'].fillna(0)**2 + 
-            accel['accel_z'].fillna(0)**2
-        )
+    if len(accel_rows) > 0:
+        accel_mag = _magnitude(accel_rows)
         features['accel_magnitude_mean'] = accel_mag.mean()
         features['accel_magnitude_max'] = accel_mag.max()
-        features['accel_magnitude_std'] = accel_mag.std()
+        features['accel_magnitude_std'] = _std(accel_mag)
     
     # Gyroscope magnitude
-    if len(gyro) > 0:
-        gyro_mag = np.sqrt(
-            gyro['gyro_x'].fillna(0)**2 + 
-            gyro['gyro_y'].fillna(0)**2 + 
-            gyro['gyro_z'].fillna(0)**2
-        )
+    if len(gyro_rows) > 0:
+        gyro_mag = _magnitude(gyro_rows)
         features['gyro_magnitude_mean'] = gyro_mag.mean()
         features['gyro_magnitude_max'] = gyro_mag.max()
-        features['gyro_magnitude_std'] = gyro_mag.std()
+        features['gyro_magnitude_std'] = _std(gyro_mag)
     
     return features
 
 
+def _feature_index(feature_names):
+    """Cached name -> column mapping and column Index for a trained feature order."""
+    key = tuple(feature_names)
+    cached = _FEATURE_INDEX_CACHE.get(key)
+    if cached is None:
+        cached = ({name: i for i, name in enumerate(key)}, pd.Index(key))
+        _FEATURE_INDEX_CACHE[key] = cached
+    return cached
+
+
 def prepare_feature_vector(features, feature_names):
     """Convert feature dictionary to properly ordered DataFrame for prediction.
     
@@ -163,6 +245,13 @@ def prepare_feature_vector(features, feature_names):
     pd.DataFrame
         Single-row DataFrame with features in correct order, filled with 0 for missing
         
+    Notes:
+    ------
+    The row is filled in a NumPy array via a cached name -> column mapping and
+    wrapped in a DataFrame with the cached column Index, rather than built from
+    the dict and reindexed. The column names let scalers fitted on DataFrames
+    validate the input.
+        
     Example:
     --------
     >>> features = extract_window_features(buffer_df)
@@ -171,13 +260,17 @@ def prepare_feature_vector(features, feature_names):
     >>> X_scaled = scaler.transform(X)
     >>> prediction = model.predict(X_scaled)
     """
-    # Create DataFrame from features
-    feature_df = pd.DataFrame([features]).fillna(0)
+    index, columns = _feature_index(feature_names)
+    row = np.zeros((1, len(index)))
     
-    # Reindex to match training feature order
-    feature_df = feature_df.reindex(columns=feature_names, fill_value=0)
+    # Place each known feature in its training column
+    for name, value in features.items():
+        i = index.get(name)
+        if i is not None:
+            row[0, i] = value
     
-    return feature_df
+    row[np.isnan(row)] = 0.0
+    return pd.DataFrame(row, columns=columns, copy=False)
 
 
 def main():
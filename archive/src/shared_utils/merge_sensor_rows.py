@@ -26,6 +26,29 @@ import sys
 import json
 import shutil
 
+# Output column order
+MERGED_COLUMNS = [
+    'accel_x', 'accel_y', 'accel_z',
+    'gyro_x', 'gyro_y', 'gyro_z',
+    'rot_w', 'rot_x', 'rot_y', 'rot_z',
+    'timestamp'
+]
+
+# Columns taken from each sensor type's rows
+SENSOR_COLUMNS = {
+    'linear_acceleration': ['accel_x', 'accel_y', 'accel_z'],
+    'gyroscope': ['gyro_x', 'gyro_y', 'gyro_z'],
+    'rotation_vector': ['rot_w', 'rot_x', 'rot_y', 'rot_z'],
+}
+
+# Values used when a sensor has no row at a timestamp
+DEFAULT_VALUES = {
+    'accel_x': 0.0, 'accel_y': 0.0, 'accel_z': 0.0,
+    'gyro_x': 0.0, 'gyro_y': 0.0, 'gyro_z': 0.0,
+    'rot_w': 1.0, 'rot_x': 0.0, 'rot_y': 0.0, 'rot_z': 0.0,  # rot_w defaults to 1.0 (identity quaternion)
+}
+
+
 def merge_sensors_by_timestamp(df):
     """
     Merge sensor rows by timestamp into single rows.
@@ -39,58 +62,40 @@ def merge_sensors_by_timestamp(df):
         rot_w, rot_x, rot_y, rot_z, timestamp
 
     Strategy:
-    1. Group by timestamp
-    2. For each timestamp, take non-zero values from each sensor
-    3. Combine into single row
+    1. Find the sorted unique timestamps (one output row each)
+    2. Locate every input row's output row with one np.searchsorted call
+    3. Scatter each sensor's values into its columns (defaults elsewhere);
+       if a sensor has several rows at one timestamp, the last one wins
     """
     if df.empty:
         return df
 
-    # Group by timestamp
-    grouped = df.groupby('timestamp')
-
-    merged_rows = []
-
-    for timestamp, group in grouped:
-        # Initialize merged row with zeros
-        merged = {
-            'accel_x': 0.0, 'accel_y': 0.0, 'accel_z': 0.0,
-            'gyro_x': 0.0, 'gyro_y': 0.0, 'gyro_z': 0.0,
-            'rot_w': 1.0, 'rot_x': 0.0, 'rot_y': 0.0, 'rot_z': 0.0,  # rot_w defaults to 1.0 (identity quaternion)
-            'timestamp': timestamp
-        }
-
-        # Extract data from each sensor type
-        for _, row in group.iterrows():
-            sensor_type = row['sensor']
+    # Rows without a timestamp are dropped, as groupby would
+    df = df[df['timestamp'].notna()]
+    timestamps = np.unique(df['timestamp'].to_numpy())
+    positions = np.searchsorted(timestamps, df['timestamp'].to_numpy())
+    sensors = df['sensor'].to_numpy()
 
-            if sensor_type == 'linear_acceleration':
-                merged['accel_x'] = row['accel_x']
-                merged['accel_y'] = row['accel_y']
-                merged['accel_z'] = row['accel_z']
+    merged = {
+        column: np.full(len(timestamps), default)
+        for column, default in DEFAULT_VALUES.items()
+    }
+    merged['timestamp'] = timestamps
 
-            elif sensor_type == 'gyroscope':
-                merged['gyro_x'] = row['gyro_x']
-                merged['gyro_y'] = row['gyro_y']
-                merged['gyro_z'] = row['gyro_z']
+    for sensor_type, columns in SENSOR_COLUMNS.items():
+        rows = np.flatnonzero(sensors == sensor_type)[::-1]
+        if len(rows) == 0:
+            continue  # Its columns may be absent from the input
 
-            elif sensor_type == 'rotation_vector':
-                merged['rot_w'] = row['rot_w']
-                merged['rot_x'] = row['rot_x']
-                merged['rot_y'] = row['rot_y']
-                merged['rot_z'] = row['rot_z']
+        # First occurrence in reversed order = last row per timestamp
+        _, first = np.unique(positions[rows], return_index=True)
+        rows = rows[first]
 
-        merged_rows.append(merged)
+        for column in columns:
+            merged[column][positions[rows]] = df[column].to_numpy()[rows]
 
     # Create DataFrame with consistent column order
-    merged_df = pd.DataFrame(merged_rows, columns=[
-        'accel_x', 'accel_y', 'accel_z',
-        'gyro_x', 'gyro_y', 'gyro_z',
-        'rot_w', 'rot_x', 'rot_y', 'rot_z',
-        'timestamp'
-    ])
-
-    return merged_df
+    return pd.DataFrame(merged, columns=MERGED_COLUMNS)
 
 
 def process_csv_file(input_path, output_path):
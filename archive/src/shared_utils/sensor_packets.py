@@ -0,0 +1,53 @@
+"""
+Binary sensor packet format shared by the data collectors and real-time listeners.
+
+The watch sends one reading per UDP datagram, little-endian (25 bytes):
+  sensor_id  uint8       0 rotation_vector, 1 linear_acceleration, 2 gyroscope
+  timestamp  float64     sensor event time on the watch clock, in seconds
+  values     4x float32  x, y, z, w (w = 0 for 3-axis sensors)
+
+Datagrams starting with "{" carry the legacy JSON payload instead; each
+script parses those itself.
+"""
+
+import struct
+import time
+
+BINARY_PACKET = struct.Struct("<Bd4f")
+
+# Sensor type and CSV columns for each sensor_id
+BINARY_SENSOR_FIELDS = (
+    ("rotation_vector", ("rot_x", "rot_y", "rot_z", "rot_w")),
+    ("linear_acceleration", ("accel_x", "accel_y", "accel_z")),
+    ("gyroscope", ("gyro_x", "gyro_y", "gyro_z")),
+)
+BINARY_SENSORS = tuple(sensor_type for sensor_type, _ in BINARY_SENSOR_FIELDS)
+
+
+def unpack_binary_packet(data):
+    """
+    Decode a binary sensor packet from bytes or a memoryview.
+
+    Returns:
+        tuple: (sensor_type, event_time, [x, y, z, w]) or None if the packet is
+        too short or has an unknown sensor_id
+    """
+    if len(data) < BINARY_PACKET.size:
+        return None
+    sensor_id, event_time, *values = BINARY_PACKET.unpack_from(data)
+    if sensor_id >= len(BINARY_SENSORS):
+        return None
+    return BINARY_SENSORS[sensor_id], event_time, values
+
+
+def parse_binary_reading(data):
+    """Decode a binary sensor packet into a sensor reading dict (None if invalid)."""
+    if len(data) < BINARY_PACKET.size:
+        return None
+    sensor_id, _, *values = BINARY_PACKET.unpack_from(data)
+    if sensor_id >= len(BINARY_SENSOR_FIELDS):
+        return None
+    sensor_type, fields = BINARY_SENSOR_FIELDS[sensor_id]
+    sensor_reading = {"timestamp": time.time(), "sensor": sensor_type}
+    sensor_reading.update(zip(fields, values))  # zip drops w for 3-axis sensors
+    return sensor_reading
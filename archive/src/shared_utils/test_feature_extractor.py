@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Unit tests for feature_extractor.py
+
+Tests window feature extraction on windows shaped like the real-time
+listeners build them (one dict per sensor reading).
+"""
+
+import pandas as pd
+import numpy as np
+import sys
+import os
+
+# Add parent directory to path to import feature_extractor
+sys.path.insert(0, os.path.dirname(__file__))
+from feature_extractor import extract_window_features
+
+
+def make_readings(sensor, columns, n, seed=0):
+    """Per-sensor reading dicts, as buffered by the UDP listeners."""
+    rng = np.random.default_rng(seed)
+    return [
+        {'sensor': sensor, 'timestamp': i / 50, **dict(zip(columns, rng.normal(size=len(columns))))}
+        for i in range(n)
+    ]
+
+
+def test_window_missing_sensor():
+    """A window without gyroscope readings still yields accel and rotation features."""
+    readings = (
+        make_readings('linear_acceleration', ['accel_x', 'accel_y', 'accel_z'], 60, seed=1)
+        + make_readings('rotation_vector', ['rot_x', 'rot_y', 'rot_z', 'rot_w'], 60, seed=2)
+    )
+    window_df = pd.DataFrame(readings)
+
+    # The listeners' windows have no gyro columns at all in this case
+    assert 'gyro_x' not in window_df.columns
+
+    features = extract_window_features(window_df)
+
+    assert 'accel_x_mean' in features
+    assert 'accel_magnitude_mean' in features
+    assert 'rot_w_range' in features
+    assert not any(name.startswith('gyro_') for name in features)
+
+    accel = window_df[window_df['sensor'] == 'linear_acceleration']
+    assert np.isclose(features['accel_x_mean'], accel['accel_x'].mean())
+
+    print("✓ Missing sensor test passed")
+
+
+def test_window_with_all_sensors():
+    """Every sensor contributes features when all are present."""
+    readings = (
+        make_readings('linear_acceleration', ['accel_x', 'accel_y', 'accel_z'], 50, seed=1)
+        + make_readings('gyroscope', ['gyro_x', 'gyro_y', 'gyro_z'], 50, seed=2)
+        + make_readings('rotation_vector', ['rot_x', 'rot_y', 'rot_z', 'rot_w'], 50, seed=3)
+    )
+    features = extract_window_features(pd.DataFrame(readings))
+
+    assert 'accel_x_fft_max' in features
+    assert 'gyro_z_rms' in features
+    assert 'gyro_magnitude_std' in features
+    assert 'rot_x_std' in features
+
+    print("✓ All sensors test passed")
+
+
+def test_magnitude_counts_missing_axis_as_zero():
+    """Magnitude features use every reading, with a missing axis as 0."""
+    readings = make_readings('linear_acceleration', ['accel_x', 'accel_y', 'accel_z'], 40, seed=4)
+    window_df = pd.DataFrame(readings)
+    window_df.loc[[5, 17], 'accel_y'] = np.nan
+
+    features = extract_window_features(window_df)
+
+    filled = window_df[['accel_x', 'accel_y', 'accel_z']].fillna(0)
+    magnitude = np.sqrt((filled**2).sum(axis=1))
+    assert np.isclose(features['accel_magnitude_mean'], magnitude.mean())
+    assert np.isclose(features['accel_magnitude_std'], magnitude.std())
+
+    print("✓ Magnitude missing axis test passed")
+
+
+def run_all_tests():
+    """Run all tests."""
+    print("Running feature_extractor tests...\n")
+
+    try:
+        test_window_missing_sensor()
+        test_window_with_all_sensors()
+        test_magnitude_counts_missing_axis_as_zero()
+
+        print("\n✅ All tests passed!")
+        return True
+    except AssertionError as e:
+        print(f"\n❌ Test failed: {e}")
+        return False
+    except Exception as e:
+        print(f"\n❌ Unexpected error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+if __name__ == '__main__':
+    success = run_all_tests()
+    sys.exit(0 if success else 1)
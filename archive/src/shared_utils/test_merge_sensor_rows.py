@@ -206,6 +206,28 @@ def test_real_data_reduction():
     print("✓ Real data reduction test passed")
 
 
+def test_missing_sensor_columns():
+    """Test input without the columns of sensors that have no rows."""
+    data = {
+        'accel_x': [1.0, 2.0],
+        'accel_y': [3.0, 4.0],
+        'accel_z': [5.0, 6.0],
+        'sensor': ['linear_acceleration', 'linear_acceleration'],
+        'timestamp': [100, 200]
+    }
+    df = pd.DataFrame(data)
+
+    merged = merge_sensors_by_timestamp(df)
+
+    assert len(merged) == 2, f"Expected 2 rows, got {len(merged)}"
+    assert list(merged['accel_x']) == [1.0, 2.0]
+    # Absent sensors get their defaults
+    assert (merged['gyro_x'] == 0.0).all()
+    assert (merged['rot_w'] == 1.0).all()
+
+    print("✓ Missing sensor columns test passed")
+
+
 def run_all_tests():
     """Run all tests."""
     print("Running merge_sensor_rows tests...\n")
@@ -215,6 +237,7 @@ def run_all_tests():
         test_multiple_timestamps()
         test_missing_sensors()
         test_empty_dataframe()
+        test_missing_sensor_columns()
         test_column_order()
         test_real_data_reduction()
         